@@ -2,84 +2,213 @@
 Configuration management for the Smart Light Controller application
 """
 
+import copy
 import json
 import logging
 import os
+import sys
+import threading
 from pathlib import Path
 
-from .constants import CONFIG_FILE, APP_NAME
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+from .constants import (
+    CONFIG_DIR, CONFIG_FILE, CONFIG_SAVE_DELAY, CONFIG_SAVE_RETRIES, APP_NAME
+)
 
 logger = logging.getLogger(APP_NAME)
 
+# Sentinel for settings that are not present
+_MISSING = object()
+
+# Buffer size for config file I/O; the file is always read/written in one call
+_IO_BUFFER_SIZE = 65536
+
+
+def _json_loads(data):
+    """Decode JSON text or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """
+    Encode an object as indented JSON bytes, using orjson when available
+    
+    Both encoders produce the same file: two-space indentation, UTF-8 text
+    rather than escapes, and non-string dict keys written as strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Default configuration, copied for each ConfigManager instance
+_DEFAULT_CONFIG = {
+    'version': 1,
+    'first_run': True,
+    'devices': {
+        'hue_bridges': {},
+        'lifx_lights': {}
+    },
+    'groups': {},
+    'schedules': {},
+    'settings': {
+        'auto_discover': True,
+        'discover_on_startup': True,
+        'dark_mode': False,
+        'startup_check_updates': True,
+        'notification_level': 'normal'  # 'minimal', 'normal', 'verbose'
+    },
+    'window': {
+        'width': 900,
+        'height': 600,
+        'maximized': False,
+        'position_x': 100,
+        'position_y': 100,
+        'geometry': '',  # Base64 QWidget.saveGeometry() data
+        'state': ''      # Base64 QMainWindow.saveState() data
+    },
+    'last_protocol': 'hue'  # Last protocol tab selected
+}
+
+# Collections stored in memory as id-keyed dicts and on disk as lists
+_DEVICE_COLLECTIONS = ('hue_bridges', 'lifx_lights')
+_TOP_LEVEL_COLLECTIONS = ('groups', 'schedules')
+
 
 class ConfigManager:
     """
     Manages application configuration, including saved lights, groups, and user preferences.
     Handles loading and saving configuration to disk.
+    
+    Devices, groups and schedules are held as dictionaries keyed by ID so that
+    lookups and updates are O(1); they are converted to lists only when the
+    configuration is written to disk.
+    
+    Changes are written back after a short delay so bursts of updates (for
+    example during device discovery) result in a single disk write.
     """
     
+    # Whether the configuration directory has been created in this process
+    _dir_ensured = False
+    
     def __init__(self):
         """Initialize configuration manager with default settings"""
-        self.config = {
-            'version': 1,
-            'first_run': True,
-            'devices': {
-                'hue_bridges': [],
-                'lifx_lights': []
-            },
-            'groups': [],
-            'schedules': [],
-            'settings': {
-                'auto_discover': True,
-                'discover_on_startup': True,
-                'dark_mode': False,
-                'startup_check_updates': True,
-                'notification_level': 'normal'  # 'minimal', 'normal', 'verbose'
-            },
-            'window': {
-                'width': 900,
-                'height': 600,
-                'maximized': False,
-                'position_x': 100,
-                'position_y': 100
-            },
-            'last_protocol': 'hue'  # Last protocol tab selected
-        }
+        self.config = copy.deepcopy(_DEFAULT_CONFIG)
         self.config_file = CONFIG_FILE
+        self._config_dir = os.path.dirname(self.config_file)
+        
+        # Create the configuration directory once per process
+        if not ConfigManager._dir_ensured:
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            ConfigManager._dir_ensured = True
+        
+        # Change tracking so unchanged configuration is not rewritten
+        self._dirty = True  # Defaults have not been written to disk yet
+        self._last_serialized = None
+        
+        # Deferred save, started by the first change after a write
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._save_retries = 0  # Consecutive saves retried after a serialization race
     
     def load_config(self):
         """Load configuration from disk, creating default if none exists"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
-                    # Update config with loaded values, maintaining defaults for missing keys
-                    self._update_config_recursive(self.config, loaded_config)
-                logger.info(f"Configuration loaded from {self.config_file}")
-                return True
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error loading configuration: {e}")
-                # Backup corrupted config
-                if os.path.exists(self.config_file):
-                    backup_path = str(self.config_file) + ".bak"
-                    try:
-                        os.rename(self.config_file, backup_path)
-                        logger.info(f"Backed up corrupted config to {backup_path}")
-                    except OSError as e:
-                        logger.error(f"Could not backup corrupted config: {e}")
-                return False
-        else:
+        try:
+            with open(self.config_file, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+                data = f.read()
+        except FileNotFoundError:
             logger.info("No configuration file found, using defaults")
             return self.save_config()  # Create a new config file with defaults
+        except IOError as e:
+            logger.error(f"Error loading configuration: {e}")
+            return False
+        
+        try:
+            loaded_config = _json_loads(data)
+            # Collections are rebuilt as id-keyed dicts rather than merged
+            collections = self._extract_collections(loaded_config)
+            # Update config with loaded values, maintaining defaults for missing keys
+            self._update_config(self.config, loaded_config)
+            self._restore_collections(collections)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error loading configuration: {e}")
+            # Backup corrupted config (saves are atomic, so this only
+            # happens if the file was damaged outside the application)
+            backup_path = str(self.config_file) + ".bak"
+            try:
+                os.rename(self.config_file, backup_path)
+                logger.info(f"Backed up corrupted config to {backup_path}")
+            except OSError as e:
+                logger.error(f"Could not backup corrupted config: {e}")
+            return False
+        
+        self._dirty = False
+        logger.info(f"Configuration loaded from {self.config_file}")
+        return True
     
     def save_config(self):
-        """Save current configuration to disk"""
+        """Save current configuration to disk if it has changed"""
+        with self._save_lock:
+            # An explicit save supersedes any pending deferred save
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            
+            if not self._dirty:
+                return True
+            
+            return self._write_config()
+    
+    def _write_config(self):
+        """Serialize and write the configuration (called with the save lock held)"""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+            # Ensure directory exists (normally already created in __init__)
+            if not ConfigManager._dir_ensured:
+                os.makedirs(self._config_dir, exist_ok=True)
+                ConfigManager._dir_ensured = True
+            
+            # Serialize first so the file is written with a single write() call
+            try:
+                data = _json_dumps(self._serializable_config())
+            except RuntimeError as e:
+                # Worker threads may change a device entry while the encoder
+                # walks it; keep the changes pending and try again shortly
+                if self._save_retries < CONFIG_SAVE_RETRIES:
+                    self._save_retries += 1
+                    logger.warning(f"Could not serialize configuration, retrying: {e}")
+                    self._start_save_timer()
+                else:
+                    self._save_retries = 0
+                    logger.error(f"Error serializing configuration: {e}")
+                return False
+            except (TypeError, ValueError) as e:
+                # A value that cannot be encoded will not fix itself; leave the
+                # changes pending for the next save instead of retrying
+                self._save_retries = 0
+                logger.error(f"Error serializing configuration: {e}")
+                return False
             
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            self._save_retries = 0
+            if data == self._last_serialized:
+                self._dirty = False
+                return True
+            
+            # Write to a temporary file and swap it in so a crash mid-write
+            # never leaves a truncated config behind
+            temp_path = str(self.config_file) + ".tmp"
+            with open(temp_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_file)
+            self._last_serialized = data
+            self._dirty = False
             logger.info(f"Configuration saved to {self.config_file}")
             return True
         except (IOError, OSError) as e:
@@ -108,12 +237,49 @@ class ConfigManager:
             value: The new value
             
         Returns:
-            True if setting was updated, False otherwise
+            True if setting was changed, False otherwise
         """
-        if key in self.config['settings'] or value is not None:
-            self.config['settings'][key] = value
-            return True
-        return False
+        settings = self.config['settings']
+        current = settings.get(key, _MISSING)
+        if current is _MISSING and value is None:
+            return False
+        
+        # Skip no-op updates so they do not trigger a save
+        if current == value:
+            return False
+        
+        settings[key] = value
+        self._mark_dirty()
+        return True
+    
+    def update_settings(self, settings):
+        """
+        Update several settings with a single change notification
+        
+        Args:
+            settings: Dictionary of setting keys and new values
+            
+        Returns:
+            True if any setting was changed, False otherwise
+        """
+        current_settings = self.config['settings']
+        changed = False
+        
+        for key, value in settings.items():
+            current = current_settings.get(key, _MISSING)
+            if current is _MISSING and value is None:
+                continue
+            
+            # Skip no-op updates so they do not trigger a save
+            if current == value:
+                continue
+            
+            current_settings[key] = value
+            changed = True
+        
+        if changed:
+            self._mark_dirty()
+        return changed
     
     def get_window_settings(self):
         """Get the saved window configuration"""
@@ -122,6 +288,7 @@ class ConfigManager:
     def update_window_settings(self, settings):
         """Update window configuration with new values"""
         self.config['window'].update(settings)
+        self._mark_dirty()
     
     def get_devices(self, protocol=None):
         """
@@ -134,11 +301,14 @@ class ConfigManager:
             Dictionary of devices by protocol or list of a specific protocol
         """
         if protocol == 'hue':
-            return self.config['devices']['hue_bridges']
+            return list(self.config['devices']['hue_bridges'].values())
         elif protocol == 'lifx':
-            return self.config['devices']['lifx_lights']
+            return list(self.config['devices']['lifx_lights'].values())
         else:
-            return self.config['devices']
+            return {
+                key: list(devices.values())
+                for key, devices in self.config['devices'].items()
+            }
     
     def add_device(self, protocol, device_info):
         """
@@ -152,28 +322,14 @@ class ConfigManager:
             True if device was added/updated, False otherwise
         """
         if protocol == 'hue':
-            # For Hue, check if bridge already exists by ID
-            if 'id' in device_info:
-                for i, bridge in enumerate(self.config['devices']['hue_bridges']):
-                    if bridge.get('id') == device_info['id']:
-                        # Update existing bridge
-                        self.config['devices']['hue_bridges'][i].update(device_info)
-                        return True
-                # Add new bridge
-                self.config['devices']['hue_bridges'].append(device_info)
-                return True
+            devices = self.config['devices']['hue_bridges']
         elif protocol == 'lifx':
-            # For LIFX, check if light already exists by ID
-            if 'id' in device_info:
-                for i, light in enumerate(self.config['devices']['lifx_lights']):
-                    if light.get('id') == device_info['id']:
-                        # Update existing light
-                        self.config['devices']['lifx_lights'][i].update(device_info)
-                        return True
-                # Add new light
-                self.config['devices']['lifx_lights'].append(device_info)
-                return True
-        return False
+            devices = self.config['devices']['lifx_lights']
+        else:
+            return False
+        
+        # Devices are keyed by ID, so existing entries are updated in place
+        return self._upsert(devices, device_info)
     
     def remove_device(self, protocol, device_id):
         """
@@ -187,62 +343,65 @@ class ConfigManager:
             True if device was removed, False otherwise
         """
         if protocol == 'hue':
-            for i, bridge in enumerate(self.config['devices']['hue_bridges']):
-                if bridge.get('id') == device_id:
-                    self.config['devices']['hue_bridges'].pop(i)
-                    return True
+            devices = self.config['devices']['hue_bridges']
         elif protocol == 'lifx':
-            for i, light in enumerate(self.config['devices']['lifx_lights']):
-                if light.get('id') == device_id:
-                    self.config['devices']['lifx_lights'].pop(i)
-                    return True
-        return False
+            devices = self.config['devices']['lifx_lights']
+        else:
+            return False
+        
+        return self._remove(devices, device_id)
     
     def get_groups(self):
         """Get configured light groups"""
-        return self.config['groups']
+        return list(self.config['groups'].values())
+    
+    def get_group(self, group_id):
+        """Get a light group by ID, or None if it does not exist"""
+        return self.config['groups'].get(group_id)
     
     def add_group(self, group_info):
         """Add or update a light group"""
-        if 'id' in group_info:
-            for i, group in enumerate(self.config['groups']):
-                if group.get('id') == group_info['id']:
-                    self.config['groups'][i].update(group_info)
-                    return True
-            self.config['groups'].append(group_info)
-            return True
-        return False
+        return self._upsert(self.config['groups'], group_info)
     
     def remove_group(self, group_id):
         """Remove a light group"""
-        for i, group in enumerate(self.config['groups']):
-            if group.get('id') == group_id:
-                self.config['groups'].pop(i)
-                return True
-        return False
+        return self._remove(self.config['groups'], group_id)
     
     def get_schedules(self):
         """Get configured schedules"""
-        return self.config['schedules']
+        return list(self.config['schedules'].values())
     
     def add_schedule(self, schedule_info):
         """Add or update a schedule"""
-        if 'id' in schedule_info:
-            for i, schedule in enumerate(self.config['schedules']):
-                if schedule.get('id') == schedule_info['id']:
-                    self.config['schedules'][i].update(schedule_info)
-                    return True
-            self.config['schedules'].append(schedule_info)
-            return True
-        return False
+        return self._upsert(self.config['schedules'], schedule_info)
     
     def remove_schedule(self, schedule_id):
         """Remove a schedule"""
-        for i, schedule in enumerate(self.config['schedules']):
-            if schedule.get('id') == schedule_id:
-                self.config['schedules'].pop(i)
-                return True
-        return False
+        return self._remove(self.config['schedules'], schedule_id)
+    
+    def update_last_runs(self, last_runs):
+        """
+        Record the last run times of several schedules with a single change
+        
+        Args:
+            last_runs: Dictionary of schedule ID -> last run time (ISO format)
+            
+        Returns:
+            bool: True if any schedule was updated, False otherwise
+        """
+        schedules = self.config['schedules']
+        updated = False
+        
+        for schedule_id, last_run in last_runs.items():
+            schedule = schedules.get(schedule_id)
+            if schedule is not None:
+                schedule['last_run'] = last_run
+                updated = True
+        
+        if updated:
+            self._mark_dirty()
+        
+        return updated
     
     def get_last_protocol(self):
         """Get the last selected protocol tab"""
@@ -252,22 +411,141 @@ class ConfigManager:
         """Set the last selected protocol tab"""
         if protocol in ['hue', 'lifx']:
             self.config['last_protocol'] = protocol
+            self._mark_dirty()
             return True
         return False
     
-    def _update_config_recursive(self, target, source):
+    def _update_config(self, target, source):
         """
-        Recursively update configuration while maintaining structure and defaults
+        Update configuration while maintaining structure and defaults
+        
+        Nested dictionaries are merged iteratively using an explicit stack
+        instead of recursion.
         
         Args:
             target: Target dictionary to update (our default config)
             source: Source dictionary with values to apply
         """
-        for key, value in source.items():
-            if key in target:
-                if isinstance(value, dict) and isinstance(target[key], dict):
-                    # Recursively update nested dictionaries
-                    self._update_config_recursive(target[key], value)
-                else:
-                    # Update simple values
-                    target[key] = value
+        stack = [(target, source)]
+        pop = stack.pop
+        push = stack.append
+        
+        while stack:
+            tgt, src = pop()
+            for key, value in src.items():
+                if key in tgt:
+                    current = tgt[key]
+                    if isinstance(value, dict) and isinstance(current, dict):
+                        # Merge nested dictionaries on a later iteration
+                        push((current, value))
+                    else:
+                        # Update simple values
+                        tgt[key] = value
+    
+    def _upsert(self, collection, info):
+        """
+        Add an entry to an id-keyed collection or update the existing one
+        
+        Args:
+            collection: Dictionary of entries keyed by ID
+            info: Entry dictionary, must contain an 'id' key
+            
+        Returns:
+            True if the entry was added/updated, False if it has no ID
+        """
+        try:
+            entry_id = info['id']
+        except KeyError:
+            return False
+        
+        existing = collection.get(entry_id)
+        if existing is None:
+            collection[entry_id] = info
+        elif existing is not info:
+            existing.update(info)
+        self._mark_dirty()
+        return True
+    
+    def _remove(self, collection, entry_id):
+        """
+        Remove an entry from an id-keyed collection
+        
+        Args:
+            collection: Dictionary of entries keyed by ID
+            entry_id: ID of the entry to remove
+            
+        Returns:
+            True if the entry was removed, False if it was not found
+        """
+        if collection.pop(entry_id, None) is None:
+            return False
+        self._mark_dirty()
+        return True
+    
+    def _mark_dirty(self):
+        """Flag the configuration as changed and schedule a deferred save"""
+        with self._save_lock:
+            self._dirty = True
+            
+            # Coalesce changes into the already pending save, if any
+            if self._save_timer is None:
+                self._start_save_timer()
+    
+    def _start_save_timer(self):
+        """Schedule a deferred save (called with the save lock held)"""
+        self._save_timer = threading.Timer(CONFIG_SAVE_DELAY, self.save_config)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _extract_collections(self, loaded_config):
+        """
+        Remove list-based collections from loaded configuration data
+        
+        Args:
+            loaded_config: Configuration dictionary as read from disk
+            
+        Returns:
+            dict: Collection name -> list of entries
+        """
+        collections = {}
+        devices = loaded_config.get('devices')
+        if isinstance(devices, dict):
+            for key in _DEVICE_COLLECTIONS:
+                if key in devices:
+                    collections[key] = devices.pop(key)
+        for key in _TOP_LEVEL_COLLECTIONS:
+            if key in loaded_config:
+                collections[key] = loaded_config.pop(key)
+        return collections
+    
+    def _restore_collections(self, collections):
+        """
+        Rebuild id-keyed collections from lists of entries
+        
+        Args:
+            collections: Collection name -> list of entries
+        """
+        for key, entries in collections.items():
+            if key in _DEVICE_COLLECTIONS:
+                target = self.config['devices'][key]
+            else:
+                target = self.config[key]
+            
+            target.clear()
+            for entry in entries if isinstance(entries, list) else []:
+                if isinstance(entry, dict) and 'id' in entry:
+                    # Decoded keys are not interned; intern them so lookups
+                    # with the literal keys used in code hit the identity check
+                    entry = {sys.intern(key): value for key, value in entry.items()}
+                    target[entry['id']] = entry
+    
+    def _serializable_config(self):
+        """Get a copy of the configuration with collections converted to lists"""
+        config = dict(self.config)
+        config['devices'] = {
+            key: list(devices.values()) if key in _DEVICE_COLLECTIONS else devices
+            for key, devices in self.config['devices'].items()
+        }
+        for key in _TOP_LEVEL_COLLECTIONS:
+            config[key] = list(self.config[key].values())
+        return config
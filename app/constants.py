@@ -15,8 +15,9 @@ APP_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_DIR = Path.home() / '.smart_light_controller'
 CONFIG_FILE = CONFIG_DIR / 'config.json'
 
-# Ensure config directory exists
-CONFIG_DIR.mkdir(exist_ok=True)
+# Delay before pending configuration changes are written to disk
+CONFIG_SAVE_DELAY = 0.5  # seconds
+CONFIG_SAVE_RETRIES = 3  # deferred retries when serialization races a change
 
 # Logging configuration
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -24,6 +25,8 @@ LOG_LEVEL = logging.INFO
 
 # UI Constants
 UI_REFRESH_RATE = 500  # milliseconds
+UPDATE_COALESCE_INTERVAL = 50  # milliseconds
+CONTROL_SEND_INTERVAL = 80  # milliseconds between slider-driven light commands
 DEFAULT_WINDOW_WIDTH = 900
 DEFAULT_WINDOW_HEIGHT = 600
 
@@ -39,7 +42,15 @@ BRIGHTNESS_RANGE = (0, 254)
 # Network settings
 DISCOVERY_TIMEOUT = 5  # seconds
 NETWORK_TIMEOUT = 3    # seconds
+NETWORK_CONNECT_TIMEOUT = 1.0  # seconds to establish a connection
 HUE_BRIDGE_DISCOVERY_URL = "https://discovery.meethue.com/"
+HUE_DISCOVERY_CACHE_TTL = 60  # seconds
+HUE_LIGHTS_CACHE_TTL = 5  # seconds
+LIFX_DISCOVERY_CACHE_TTL = 300  # seconds
+HUE_STATE_CACHE_TTL = 5  # seconds a written Hue light state is trusted
+HUE_POOL_CONNECTIONS = 2  # Connection pools kept by each Hue session
+HUE_POOL_MAXSIZE = 16     # Connections kept per bridge
+PROTOCOL_MAX_WORKERS = 32  # shared pool for concurrent protocol I/O
 
 # Common light attributes
 ATTR_BRIGHTNESS = "brightness"
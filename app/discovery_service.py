@@ -3,11 +3,12 @@ Discovery service for finding smart light devices on the network
 """
 
 import logging
-import threading
 import time
-from PySide6.QtCore import QObject, Signal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
 
-from .constants import APP_NAME, DISCOVERY_TIMEOUT
+from .constants import APP_NAME, DISCOVERY_TIMEOUT, HUE_DISCOVERY_CACHE_TTL
 from .protocols.hue_protocol import HueProtocol
 from .protocols.lifx_protocol import LifxProtocol
 
@@ -15,6 +16,59 @@ from .protocols.lifx_protocol import LifxProtocol
 logger = logging.getLogger(APP_NAME)
 
 
+@dataclass(slots=True)
+class DiscoveredDevice:
+    """
+    Summary of a newly discovered device, as carried by devices_discovered
+    """
+    
+    protocol: str
+    name: str
+    ip: str
+    id: str
+    extra: dict = field(default_factory=dict)
+    
+    @classmethod
+    def from_info(cls, protocol, device_info):
+        """
+        Build a record from a protocol's device info dictionary
+        
+        Args:
+            protocol: Protocol the device was discovered with
+            device_info: Device info dictionary from the protocol handler
+            
+        Returns:
+            DiscoveredDevice: Record with the common fields extracted
+        """
+        extra = {
+            key: value for key, value in device_info.items()
+            if key not in ('name', 'ip', 'id')
+        }
+        return cls(
+            protocol,
+            device_info.get('name', 'Unknown'),
+            device_info.get('ip', ''),
+            device_info.get('id', ''),
+            extra
+        )
+
+
+class DiscoveryRunnable(QRunnable):
+    """
+    Runs a discovery pass on a QThreadPool worker thread
+    """
+    
+    def __init__(self, service, force=False):
+        """Initialize the runnable with the discovery service to run"""
+        super().__init__()
+        self.service = service
+        self.force = force
+    
+    def run(self):
+        """Perform the blocking discovery work"""
+        self.service._run_discovery(self.force)
+
+
 class DiscoveryService(QObject):
     """
     Service for discovering smart light devices on the network
@@ -24,46 +78,56 @@ class DiscoveryService(QObject):
     # Signals
     discovery_started = Signal()
     discovery_finished = Signal(bool)  # Success flag
-    device_discovered = Signal(str, dict)  # Protocol, device info
+    devices_discovered = Signal(str, list)  # Protocol, list of DiscoveredDevice
     
     def __init__(self, light_manager):
         """Initialize discovery service with light manager reference"""
         super().__init__()
         self.light_manager = light_manager
         self.discovery_active = False
-        self.discovery_thread = None
         
         # Initialize protocol handlers
         self.hue = HueProtocol()
         self.lifx = LifxProtocol()
+        
+        # Last Hue bridge discovery result: (monotonic timestamp, bridges)
+        self._hue_cache = (0.0, [])
     
-    def discover_devices(self):
-        """Start device discovery in a background thread"""
+    def discover_devices(self, force=False):
+        """
+        Start device discovery on the global thread pool
+        
+        Args:
+            force: Bypass cached discovery results
+            
+        Returns:
+            bool: True if discovery was started, False if one is already running
+        """
         if self.discovery_active:
             logger.warning("Discovery already in progress")
             return False
         
-        self.discovery_thread = threading.Thread(
-            target=self._run_discovery,
-            daemon=True
-        )
-        self.discovery_thread.start()
+        # Mark discovery as running before queuing it so repeated requests
+        # cannot queue a second pass
+        self.discovery_active = True
+        QThreadPool.globalInstance().start(DiscoveryRunnable(self, force))
         return True
     
-    def _run_discovery(self):
-        """Run device discovery for all protocols (in background thread)"""
-        self.discovery_active = True
+    def _run_discovery(self, force=False):
+        """Run device discovery for all protocols (in a worker thread)"""
         self.discovery_started.emit()
         
         logger.info("Starting device discovery")
         success = False
         
         try:
-            # Discover Philips Hue bridges
-            hue_success = self._discover_hue_devices()
-            
-            # Discover LIFX devices
-            lifx_success = self._discover_lifx_devices()
+            # Discover Philips Hue bridges and LIFX devices concurrently;
+            # both are network-bound and independent of each other
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                hue_future = executor.submit(self._discover_hue_devices, force)
+                lifx_future = executor.submit(self._discover_lifx_devices)
+                hue_success = hue_future.result()
+                lifx_success = lifx_future.result()
             
             # Overall success if at least one protocol succeeded
             success = hue_success or lifx_success
@@ -76,13 +140,20 @@ class DiscoveryService(QObject):
         self.discovery_finished.emit(success)
         logger.info(f"Device discovery completed: {'success' if success else 'failed'}")
     
-    def _discover_hue_devices(self):
+    def _discover_hue_devices(self, force=False):
         """Discover Philips Hue bridges and lights"""
         logger.info("Discovering Hue bridges...")
         
         try:
-            # Step 1: Find Hue bridges on the network
-            bridges = self.hue.discover_bridges()
+            # Step 1: Find Hue bridges on the network, reusing a recent result
+            now = time.monotonic()
+            cached_at, cached_bridges = self._hue_cache
+            if not force and cached_bridges and now - cached_at < HUE_DISCOVERY_CACHE_TTL:
+                logger.info("Using cached Hue bridge discovery results")
+                bridges = cached_bridges
+            else:
+                bridges = self.hue.discover_bridges()
+                self._hue_cache = (now, bridges)
             
             if not bridges:
                 logger.info("No Hue bridges found")
@@ -91,13 +162,14 @@ class DiscoveryService(QObject):
             logger.info(f"Found {len(bridges)} Hue bridge(s)")
             
             # Step 2: For each bridge, try to connect and get lights
-            for bridge in bridges:
-                # Add the bridge to the light manager
-                bridge_added = self.light_manager.add_hue_bridge(bridge)
-                
-                if bridge_added:
-                    # Emit signal for discovered bridge
-                    self.device_discovered.emit('hue', bridge)
+            added = [
+                DiscoveredDevice.from_info('hue', bridge) for bridge in bridges
+                if self.light_manager.add_hue_bridge(bridge)
+            ]
+            
+            # Emit a single signal for all discovered bridges
+            if added:
+                self.devices_discovered.emit('hue', added)
             
             return True
             
@@ -120,12 +192,14 @@ class DiscoveryService(QObject):
             logger.info(f"Found {len(lights)} LIFX light(s)")
             
             # Add each light to the light manager
-            for light in lights:
-                light_added = self.light_manager.add_lifx_light(light)
-                
-                if light_added:
-                    # Emit signal for discovered light
-                    self.device_discovered.emit('lifx', light)
+            added = [
+                DiscoveredDevice.from_info('lifx', light) for light in lights
+                if self.light_manager.add_lifx_light(light)
+            ]
+            
+            # Emit a single signal for all discovered lights
+            if added:
+                self.devices_discovered.emit('lifx', added)
             
             return True
             
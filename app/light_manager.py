@@ -2,12 +2,19 @@
 Light Manager for handling all light devices across different protocols
 """
 
+import copy
 import logging
-import uuid
 import threading
-from PySide6.QtCore import QObject, Signal
+import time
+import uuid
+from concurrent.futures import as_completed
+from PySide6.QtCore import Qt, QObject, QRunnable, QTimer, Signal, Slot
 
-from .constants import APP_NAME, PROTOCOL_HUE, PROTOCOL_LIFX
+from .constants import (
+    APP_NAME, PROTOCOL_HUE, PROTOCOL_LIFX,
+    UPDATE_COALESCE_INTERVAL, HUE_LIGHTS_CACHE_TTL
+)
+from .rwlock import ReadWriteLock
 from .protocols.hue_protocol import HueProtocol
 from .protocols.lifx_protocol import LifxProtocol
 
@@ -15,6 +22,28 @@ from .protocols.lifx_protocol import LifxProtocol
 logger = logging.getLogger(APP_NAME)
 
 
+class AddDeviceRunnable(QRunnable):
+    """
+    Adds a saved device to the light manager on a QThreadPool worker thread
+    """
+    
+    def __init__(self, protocol, device_info, light_manager):
+        """Initialize the runnable with the device to add"""
+        super().__init__()
+        self.protocol = protocol
+        self.device_info = device_info
+        self.light_manager = light_manager
+    
+    def run(self):
+        """Add the device, including its blocking network handshake"""
+        if self.protocol == PROTOCOL_HUE:
+            self.light_manager.add_hue_bridge(self.device_info)
+        elif self.protocol == PROTOCOL_LIFX:
+            self.light_manager.add_lifx_light(self.device_info)
+        else:
+            logger.error(f"Unsupported protocol: {self.protocol}")
+
+
 class LightManager(QObject):
     """
     Manages all smart light devices across different protocols
@@ -22,8 +51,11 @@ class LightManager(QObject):
     """
     
     # Signals
-    devices_updated = Signal()  # Emitted when the device list changes
-    light_state_changed = Signal(str, str, dict)  # Protocol, light ID, new state
+    devices_updated = Signal(dict)  # Device list changes: {'added': [...], 'changed': [...]}
+    states_changed_bulk = Signal(list)  # List of (protocol, light ID, new state)
+    lights_added = Signal(str, dict)  # Protocol, light ID -> light info
+    device_status_changed = Signal(int, int)  # Connected count, total count
+    _flush_requested = Signal()  # Starts the update timer on the manager's thread
     
     def __init__(self, config_manager):
         """Initialize the light manager with configuration manager"""
@@ -38,9 +70,45 @@ class LightManager(QObject):
         self.hue_bridges = {}  # Bridge ID -> bridge info
         self.hue_lights = {}   # Light ID -> light info
         self.lifx_lights = {}  # Light ID -> light info
+        self._lights_by_protocol = {
+            PROTOCOL_HUE: self.hue_lights,
+            PROTOCOL_LIFX: self.lifx_lights
+        }
+        
+        # Per-protocol handlers, so adding a protocol does not touch the dispatch code
+        self._set_state_handlers = {
+            PROTOCOL_HUE: self._set_hue_state,
+            PROTOCOL_LIFX: self._set_lifx_state
+        }
+        self._refresh_handlers = {
+            PROTOCOL_HUE: self._refresh_hue_light,
+            PROTOCOL_LIFX: self._refresh_lifx_light
+        }
         
-        # Lock for thread safety
-        self.lock = threading.RLock()
+        # Recent Hue light listings: (bridge IP, username) -> (timestamp, lights)
+        self._hue_lights_cache = {}
+        
+        # Readers-writer lock for thread safety; getters take the read side
+        # so UI polling does not serialize behind device updates
+        self.lock = ReadWriteLock()
+        
+        # Running device counts, maintained under the write lock
+        self._total_count = 0
+        self._reachable_count = 0
+        self._last_device_status = None  # Last (connected, total) announced
+        
+        # Coalesce UI notifications so bursts of updates trigger one refresh
+        self._pending_lock = threading.Lock()
+        self._pending_state_updates = {}  # (protocol, light ID) -> new state
+        self._pending_devices_updated = False
+        self._pending_device_changes = {}  # (protocol, light ID) -> ('added' or 'changed', light)
+        self._flush_scheduled = False  # Set while a flush is queued or pending
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_COALESCE_INTERVAL)
+        self._update_timer.timeout.connect(self._flush_updates, Qt.DirectConnection)
+        # Emitted from worker threads; queued so the timer starts on our thread
+        self._flush_requested.connect(self._start_update_timer, Qt.QueuedConnection)
     
     def add_hue_bridge(self, bridge_info):
         """
@@ -52,13 +120,13 @@ class LightManager(QObject):
         Returns:
             bool: True if bridge was added/updated, False otherwise
         """
-        with self.lock:
-            if 'id' not in bridge_info:
-                logger.error("Cannot add Hue bridge without ID")
-                return False
-            
-            bridge_id = bridge_info['id']
-            
+        if 'id' not in bridge_info:
+            logger.error("Cannot add Hue bridge without ID")
+            return False
+        
+        bridge_id = bridge_info['id']
+        
+        with self.lock.write():
             # Check if bridge already exists
             if bridge_id in self.hue_bridges:
                 logger.info(f"Updating existing Hue bridge: {bridge_id}")
@@ -66,42 +134,53 @@ class LightManager(QObject):
             else:
                 logger.info(f"Adding new Hue bridge: {bridge_id}")
                 self.hue_bridges[bridge_id] = bridge_info
-            
-            # Save to configuration
-            self.config_manager.add_device(PROTOCOL_HUE, bridge_info)
-            
-            # Try to connect to bridge and get lights
-            try:
-                # Connect to bridge if IP address and username are available
-                if 'ip' in bridge_info and 'username' in bridge_info:
-                    lights = self.hue.get_lights(bridge_info['ip'], bridge_info['username'])
+            bridge = self.hue_bridges[bridge_id]
+        
+        # Save to configuration; the write to disk is deferred by the config manager
+        self.config_manager.add_device(PROTOCOL_HUE, bridge_info)
+        
+        # Try to connect to bridge and get lights (without holding the lock)
+        try:
+            # Connect to bridge if IP address and username are available
+            if 'ip' in bridge_info and 'username' in bridge_info:
+                lights = self._get_hue_lights(bridge_info['ip'], bridge_info['username'])
+                
+                new_lights = {}
+                for light_id, light_data in lights.items():
+                    # Add bridge reference to light data
+                    light_data['bridge_id'] = bridge_id
                     
-                    # Add lights to the manager
-                    for light_id, light_data in lights.items():
-                        # Add bridge reference to light data
-                        light_data['bridge_id'] = bridge_id
-                        
-                        # Add unique ID combining bridge and light IDs
-                        unique_id = f"{bridge_id}_{light_id}"
-                        light_data['id'] = unique_id
-                        
-                        # Add protocol identifier
-                        light_data['protocol'] = PROTOCOL_HUE
-                        
-                        # Store light
-                        self.hue_lights[unique_id] = light_data
-                        
-                        # Emit signal for state change
-                        self.light_state_changed.emit(PROTOCOL_HUE, unique_id, light_data)
+                    # Cache the bridge-native light ID and bridge info for fast lookups
+                    light_data['_bridge_light_id'] = light_id
+                    light_data['_bridge_ref'] = bridge
                     
-                    logger.info(f"Added {len(lights)} lights from Hue bridge {bridge_id}")
+                    # Add unique ID combining bridge and light IDs
+                    unique_id = f"{bridge_id}_{light_id}"
+                    light_data['id'] = unique_id
+                    
+                    # Add protocol identifier
+                    light_data['protocol'] = PROTOCOL_HUE
+                    
+                    new_lights[unique_id] = light_data
                 
-                self.devices_updated.emit()
-                return True
+                # Store lights
+                with self.lock.write():
+                    for unique_id, light_data in new_lights.items():
+                        new_lights[unique_id] = self._store_light(
+                            PROTOCOL_HUE, unique_id, light_data
+                        )
                 
-            except Exception as e:
-                logger.error(f"Error connecting to Hue bridge {bridge_id}: {str(e)}")
-                return False
+                # Announce all new lights at once, after the lock is released
+                self.lights_added.emit(PROTOCOL_HUE, new_lights)
+                
+                logger.info(f"Added {len(lights)} lights from Hue bridge {bridge_id}")
+            
+            self._queue_devices_updated()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error connecting to Hue bridge {bridge_id}: {str(e)}")
+            return False
     
     def add_lifx_light(self, light_info):
         """
@@ -113,59 +192,81 @@ class LightManager(QObject):
         Returns:
             bool: True if light was added/updated, False otherwise
         """
-        with self.lock:
-            if 'id' not in light_info:
-                logger.error("Cannot add LIFX light without ID")
-                return False
-            
-            light_id = light_info['id']
-            
-            # Add protocol identifier if not present
-            if 'protocol' not in light_info:
-                light_info['protocol'] = PROTOCOL_LIFX
-            
+        if 'id' not in light_info:
+            logger.error("Cannot add LIFX light without ID")
+            return False
+        
+        light_id = light_info['id']
+        
+        # Add protocol identifier if not present
+        if 'protocol' not in light_info:
+            light_info['protocol'] = PROTOCOL_LIFX
+        
+        with self.lock.write():
             # Check if light already exists
             if light_id in self.lifx_lights:
                 logger.info(f"Updating existing LIFX light: {light_id}")
-                self.lifx_lights[light_id].update(light_info)
             else:
                 logger.info(f"Adding new LIFX light: {light_id}")
-                self.lifx_lights[light_id] = light_info
+            light = self._store_light(PROTOCOL_LIFX, light_id, light_info)
+        
+        # Try to connect to the light and update its state (without holding the lock)
+        try:
+            # Get current state if MAC address or IP is available
+            if 'mac' in light_info or 'ip' in light_info:
+                state = self.lifx.get_light_state(light_info)
+                if state:
+                    with self.lock.write():
+                        self._apply_state(light, state)
             
-            # Try to connect to the light and update its state
-            try:
-                # Get current state if MAC address or IP is available
-                if 'mac' in light_info or 'ip' in light_info:
-                    state = self.lifx.get_light_state(light_info)
-                    if state:
-                        self.lifx_lights[light_id].update(state)
-                
-                # Save to configuration
-                self.config_manager.add_device(PROTOCOL_LIFX, self.lifx_lights[light_id])
-                
-                # Emit signals
-                self.light_state_changed.emit(PROTOCOL_LIFX, light_id, self.lifx_lights[light_id])
-                self.devices_updated.emit()
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"Error connecting to LIFX light {light_id}: {str(e)}")
-                return False
+            # Save to configuration; the write to disk is deferred by the config manager
+            self.config_manager.add_device(PROTOCOL_LIFX, light)
+            
+            # Queue UI notifications
+            self._queue_state_update(PROTOCOL_LIFX, light_id, light)
+            self._queue_devices_updated()
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error connecting to LIFX light {light_id}: {str(e)}")
+            return False
+    
+    def _get_hue_lights(self, bridge_ip, username):
+        """
+        Get lights from a Hue bridge, reusing a recent listing for the same bridge
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            
+        Returns:
+            dict: Dictionary of lights (ID -> light info) owned by the caller
+        """
+        key = (bridge_ip, username)
+        cached = self._hue_lights_cache.get(key)
+        if cached and time.monotonic() - cached[0] < HUE_LIGHTS_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        
+        lights = self.hue.get_lights(bridge_ip, username)
+        if lights:
+            self._hue_lights_cache[key] = (time.monotonic(), copy.deepcopy(lights))
+        return lights
     
     def get_all_lights(self):
         """
-        Get a dictionary of all lights across all protocols
+        Get all lights across all protocols
+        
+        The returned dictionary is a shallow snapshot taken under the read
+        lock, so callers can iterate it while workers add or replace lights.
+        The light info dictionaries themselves are shared, not copied.
         
         Returns:
             dict: Light ID -> light info
         """
-        with self.lock:
-            # Combine lights from all protocols
-            all_lights = {}
-            all_lights.update(self.hue_lights)
-            all_lights.update(self.lifx_lights)
-            return all_lights
+        with self.lock.read():
+            # LIFX last so it wins on duplicate IDs
+            return {**self.hue_lights, **self.lifx_lights}
     
     def get_light(self, protocol, light_id):
         """
@@ -178,17 +279,20 @@ class LightManager(QObject):
         Returns:
             dict: Light information or None if not found
         """
-        with self.lock:
-            if protocol == PROTOCOL_HUE:
-                return self.hue_lights.get(light_id)
-            elif protocol == PROTOCOL_LIFX:
-                return self.lifx_lights.get(light_id)
+        lights = self._lights_by_protocol.get(protocol)
+        if lights is None:
             return None
+        
+        with self.lock.read():
+            return lights.get(light_id)
     
     def set_light_state(self, protocol, light_id, state):
         """
         Set state for a specific light
         
+        The lock is only held to look the light up and to store the result,
+        so commands to different lights and bridges run concurrently.
+        
         Args:
             protocol: Light protocol ('hue' or 'lifx')
             light_id: Light identifier
@@ -197,67 +301,16 @@ class LightManager(QObject):
         Returns:
             bool: True if state was set successfully, False otherwise
         """
-        with self.lock:
-            try:
-                if protocol == PROTOCOL_HUE:
-                    # Get light and bridge info
-                    light = self.hue_lights.get(light_id)
-                    if not light or 'bridge_id' not in light:
-                        logger.error(f"Cannot find Hue light or bridge for {light_id}")
-                        return False
-                    
-                    bridge_id = light['bridge_id']
-                    bridge = self.hue_bridges.get(bridge_id)
-                    if not bridge or 'ip' not in bridge or 'username' not in bridge:
-                        logger.error(f"Cannot find Hue bridge info for {bridge_id}")
-                        return False
-                    
-                    # Extract the actual light ID on the bridge
-                    actual_light_id = light_id.split('_')[1]
-                    
-                    # Set state via Hue protocol
-                    success = self.hue.set_light_state(
-                        bridge['ip'], 
-                        bridge['username'],
-                        actual_light_id,
-                        state
-                    )
-                    
-                    if success:
-                        # Update local state
-                        self.hue_lights[light_id].update(self.hue.normalize_state(state))
-                        
-                        # Emit signal
-                        self.light_state_changed.emit(protocol, light_id, self.hue_lights[light_id])
-                    
-                    return success
-                    
-                elif protocol == PROTOCOL_LIFX:
-                    # Get light info
-                    light = self.lifx_lights.get(light_id)
-                    if not light:
-                        logger.error(f"Cannot find LIFX light {light_id}")
-                        return False
-                    
-                    # Set state via LIFX protocol
-                    success = self.lifx.set_light_state(light, state)
-                    
-                    if success:
-                        # Update local state with normalized values
-                        self.lifx_lights[light_id].update(self.lifx.normalize_state(state))
-                        
-                        # Emit signal
-                        self.light_state_changed.emit(protocol, light_id, self.lifx_lights[light_id])
-                    
-                    return success
-                
-                else:
-                    logger.error(f"Unsupported protocol: {protocol}")
-                    return False
-                    
-            except Exception as e:
-                logger.error(f"Error setting state for {protocol} light {light_id}: {str(e)}")
-                return False
+        handler = self._set_state_handlers.get(protocol)
+        if handler is None:
+            logger.error(f"Unsupported protocol: {protocol}")
+            return False
+        
+        try:
+            return handler(light_id, state)
+        except Exception as e:
+            logger.error(f"Error setting state for {protocol} light {light_id}: {str(e)}")
+            return False
     
     def refresh_light(self, protocol, light_id):
         """
@@ -270,68 +323,120 @@ class LightManager(QObject):
         Returns:
             bool: True if state was refreshed successfully, False otherwise
         """
-        with self.lock:
-            try:
-                if protocol == PROTOCOL_HUE:
-                    # Get light and bridge info
-                    light = self.hue_lights.get(light_id)
-                    if not light or 'bridge_id' not in light:
-                        logger.error(f"Cannot find Hue light or bridge for {light_id}")
-                        return False
-                    
-                    bridge_id = light['bridge_id']
-                    bridge = self.hue_bridges.get(bridge_id)
-                    if not bridge or 'ip' not in bridge or 'username' not in bridge:
-                        logger.error(f"Cannot find Hue bridge info for {bridge_id}")
-                        return False
-                    
-                    # Extract the actual light ID on the bridge
-                    actual_light_id = light_id.split('_')[1]
-                    
-                    # Get updated state
-                    state = self.hue.get_light_state(
-                        bridge['ip'],
-                        bridge['username'],
-                        actual_light_id
-                    )
-                    
-                    if state:
-                        # Update local state
-                        self.hue_lights[light_id].update(state)
-                        
-                        # Emit signal
-                        self.light_state_changed.emit(protocol, light_id, self.hue_lights[light_id])
-                        return True
-                    
-                    return False
-                    
-                elif protocol == PROTOCOL_LIFX:
-                    # Get light info
-                    light = self.lifx_lights.get(light_id)
-                    if not light:
-                        logger.error(f"Cannot find LIFX light {light_id}")
-                        return False
-                    
-                    # Get updated state
-                    state = self.lifx.get_light_state(light)
-                    
-                    if state:
-                        # Update local state
-                        self.lifx_lights[light_id].update(state)
-                        
-                        # Emit signal
-                        self.light_state_changed.emit(protocol, light_id, self.lifx_lights[light_id])
-                        return True
-                    
-                    return False
-                
-                else:
-                    logger.error(f"Unsupported protocol: {protocol}")
-                    return False
-                    
-            except Exception as e:
-                logger.error(f"Error refreshing state for {protocol} light {light_id}: {str(e)}")
-                return False
+        handler = self._refresh_handlers.get(protocol)
+        if handler is None:
+            logger.error(f"Unsupported protocol: {protocol}")
+            return False
+        
+        try:
+            return handler(light_id)
+        except Exception as e:
+            logger.error(f"Error refreshing state for {protocol} light {light_id}: {str(e)}")
+            return False
+    
+    def _get_hue_target(self, light_id):
+        """
+        Look up a Hue light and the bridge details needed to reach it
+        
+        Args:
+            light_id: Light identifier
+            
+        Returns:
+            tuple: (light, bridge IP, username, bridge light ID) or None if not found
+        """
+        with self.lock.read():
+            light = self.hue_lights.get(light_id)
+            if not light or '_bridge_ref' not in light:
+                logger.error(f"Cannot find Hue light or bridge for {light_id}")
+                return None
+            
+            bridge = light['_bridge_ref']
+            if 'ip' not in bridge or 'username' not in bridge:
+                logger.error(f"Cannot find Hue bridge info for {light['bridge_id']}")
+                return None
+            
+            return light, bridge['ip'], bridge['username'], light['_bridge_light_id']
+    
+    def _get_lifx_target(self, light_id):
+        """
+        Look up a LIFX light
+        
+        Args:
+            light_id: Light identifier
+            
+        Returns:
+            tuple: (light, snapshot of the light info) or None if not found
+        """
+        with self.lock.read():
+            light = self.lifx_lights.get(light_id)
+            if not light:
+                logger.error(f"Cannot find LIFX light {light_id}")
+                return None
+            
+            return light, dict(light)
+    
+    def _set_hue_state(self, light_id, state):
+        """Set state for a Hue light"""
+        target = self._get_hue_target(light_id)
+        if target is None:
+            return False
+        
+        light, bridge_ip, username, actual_light_id = target
+        
+        # Set state via Hue protocol
+        if not self.hue.set_light_state(bridge_ip, username, actual_light_id, state):
+            return False
+        
+        self._commit_state(PROTOCOL_HUE, light_id, light, self.hue.normalize_state(state))
+        return True
+    
+    def _set_lifx_state(self, light_id, state):
+        """Set state for a LIFX light"""
+        target = self._get_lifx_target(light_id)
+        if target is None:
+            return False
+        
+        light, light_info = target
+        
+        # Set state via LIFX protocol
+        if not self.lifx.set_light_state(light_info, state):
+            return False
+        
+        self._commit_state(PROTOCOL_LIFX, light_id, light, self.lifx.normalize_state(state))
+        return True
+    
+    def _refresh_hue_light(self, light_id):
+        """Refresh state for a Hue light"""
+        target = self._get_hue_target(light_id)
+        if target is None:
+            return False
+        
+        light, bridge_ip, username, actual_light_id = target
+        
+        # Drop the cached light listing for this bridge
+        self._hue_lights_cache.pop((bridge_ip, username), None)
+        
+        state = self.hue.get_light_state(bridge_ip, username, actual_light_id)
+        if not state:
+            return False
+        
+        self._commit_state(PROTOCOL_HUE, light_id, light, state)
+        return True
+    
+    def _refresh_lifx_light(self, light_id):
+        """Refresh state for a LIFX light"""
+        target = self._get_lifx_target(light_id)
+        if target is None:
+            return False
+        
+        light, light_info = target
+        
+        state = self.lifx.get_light_state(light_info)
+        if not state:
+            return False
+        
+        self._commit_state(PROTOCOL_LIFX, light_id, light, state)
+        return True
     
     def refresh_all_devices(self):
         """
@@ -340,46 +445,182 @@ class LightManager(QObject):
         Returns:
             bool: True if all devices were refreshed successfully, False otherwise
         """
-        with self.lock:
-            success = True
-            
-            # Refresh Hue lights
-            for light_id in self.hue_lights:
-                if not self.refresh_light(PROTOCOL_HUE, light_id):
+        success = True
+        futures = {}
+        self._hue_lights_cache.clear()
+        
+        # Snapshot what to query, then release the lock for the network calls
+        with self.lock.read():
+            hue_targets = []
+            for light_id, light in self.hue_lights.items():
+                bridge = light.get('_bridge_ref', {})
+                if 'ip' not in bridge or 'username' not in bridge:
+                    logger.error(f"Cannot find Hue bridge info for {light_id}")
                     success = False
+                    continue
+                hue_targets.append((light_id, light, bridge['ip'], bridge['username'],
+                                    light['_bridge_light_id']))
             
-            # Refresh LIFX lights
-            for light_id in self.lifx_lights:
-                if not self.refresh_light(PROTOCOL_LIFX, light_id):
-                    success = False
+            lifx_targets = [
+                (light_id, light, dict(light)) for light_id, light in self.lifx_lights.items()
+            ]
+        
+        # Refresh Hue lights on the shared protocol pool
+        for light_id, light, bridge_ip, username, actual_light_id in hue_targets:
+            future = self.hue.submit(
+                self.hue.get_light_state, bridge_ip, username, actual_light_id
+            )
+            futures[future] = (light_id, light)
+        
+        # Refresh LIFX lights in one batch while the Hue requests run. The
+        # batch fans out on the same pool, so it is called from this thread:
+        # waiting on it from a pool task could deadlock the pool.
+        if lifx_targets:
+            try:
+                lifx_states = self.lifx.get_light_states(
+                    [light_info for _, _, light_info in lifx_targets]
+                )
+            except Exception as e:
+                for light_id, _, _ in lifx_targets:
+                    logger.error(f"Error refreshing state for {PROTOCOL_LIFX} light {light_id}: {str(e)}")
+                success = False
+            else:
+                for (light_id, light, _), state in zip(lifx_targets, lifx_states):
+                    if not state:
+                        success = False
+                        continue
+                    
+                    self._commit_state(PROTOCOL_LIFX, light_id, light, state)
+        
+        for future in as_completed(futures):
+            light_id, light = futures[future]
+            try:
+                state = future.result()
+            except Exception as e:
+                logger.error(f"Error refreshing state for {PROTOCOL_HUE} light {light_id}: {str(e)}")
+                success = False
+                continue
+            
+            if not state:
+                success = False
+                continue
             
-            return success
+            self._commit_state(PROTOCOL_HUE, light_id, light, state)
+        
+        return success
     
-    def set_all_lights(self, on):
+    def set_many(self, states):
         """
-        Turn all lights on or off
+        Set state for several lights at once
+        
+        Hue lights on the same bridge that share a state are sent together:
+        as a single group action when they are every light on the bridge,
+        otherwise with one shared request body. Hue lights on a bridge with
+        differing states have their colors converted together and are sent
+        concurrently. All other lights are set individually.
         
         Args:
-            on: True to turn on, False to turn off
+            states: List of (protocol, light_id, state) tuples
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if all states were set successfully, False otherwise
         """
-        with self.lock:
-            success = True
-            state = {'on': on}
+        success = True
+        singles = []
+        batches = []
+        mixed = []
+        
+        with self.lock.read():
+            # Collect Hue requests per bridge
+            by_bridge = {}
+            for protocol, light_id, state in states:
+                light = self.hue_lights.get(light_id) if protocol == PROTOCOL_HUE else None
+                if light is None or 'bridge_id' not in light:
+                    singles.append((protocol, light_id, state))
+                else:
+                    by_bridge.setdefault(light['bridge_id'], []).append((light_id, state))
             
-            # Set state for Hue lights
-            for light_id in self.hue_lights:
-                if not self.set_light_state(PROTOCOL_HUE, light_id, state):
-                    success = False
+            for bridge_id, entries in by_bridge.items():
+                bridge = self.hue_bridges.get(bridge_id)
+                state = entries[0][1]
+                bridge_lights = {
+                    light_id for light_id, light in self.hue_lights.items()
+                    if light.get('bridge_id') == bridge_id
+                }
+                
+                if (bridge and 'ip' in bridge and 'username' in bridge
+                        and all(s == state for _, s in entries)):
+                    light_ids = {light_id for light_id, _ in entries}
+                    group_id = 0 if light_ids == bridge_lights else None
+                    bridge_light_ids = [
+                        self.hue_lights[light_id]['_bridge_light_id'] for light_id in light_ids
+                    ]
+                    batches.append((
+                        bridge['ip'], bridge['username'], light_ids, bridge_light_ids,
+                        state, group_id
+                    ))
+                elif bridge and 'ip' in bridge and 'username' in bridge:
+                    mixed.append((bridge['ip'], bridge['username'], [
+                        (light_id, self.hue_lights[light_id], s) for light_id, s in entries
+                    ]))
+                else:
+                    singles.extend((PROTOCOL_HUE, light_id, s) for light_id, s in entries)
+        
+        # Send one batch per bridge
+        for bridge_ip, username, light_ids, bridge_light_ids, state, group_id in batches:
+            if not self.hue.set_lights_state(
+                bridge_ip, username, bridge_light_ids, state, group_id
+            ):
+                success = False
+                continue
+            
+            normalized = self.hue.normalize_state(state)
+            updated = []
+            with self.lock.write():
+                for light_id in light_ids:
+                    light = self.hue_lights.get(light_id)
+                    if light is not None:
+                        self._apply_state(light, normalized)
+                        updated.append((light_id, light))
             
-            # Set state for LIFX lights
-            for light_id in self.lifx_lights:
-                if not self.set_light_state(PROTOCOL_LIFX, light_id, state):
+            for light_id, light in updated:
+                self._queue_state_update(PROTOCOL_HUE, light_id, light)
+        
+        # Send per-light states for each bridge together
+        for bridge_ip, username, entries in mixed:
+            results = self.hue.set_lights_states(bridge_ip, username, [
+                (light['_bridge_light_id'], state) for _, light, state in entries
+            ])
+            for (light_id, light, state), result in zip(entries, results):
+                if result:
+                    self._commit_state(PROTOCOL_HUE, light_id, light, self.hue.normalize_state(state))
+                else:
                     success = False
+        
+        # Set the remaining lights individually
+        for protocol, light_id, state in singles:
+            if not self.set_light_state(protocol, light_id, state):
+                success = False
+        
+        return success
+    
+    def set_all_lights(self, on):
+        """
+        Turn all lights on or off
+        
+        Args:
+            on: True to turn on, False to turn off
             
-            return success
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        state = {'on': on}
+        
+        with self.lock.read():
+            states = [(PROTOCOL_HUE, light_id, state) for light_id in self.hue_lights]
+            states.extend((PROTOCOL_LIFX, light_id, state) for light_id in self.lifx_lights)
+        
+        return self.set_many(states)
     
     def create_group(self, name, light_ids):
         """
@@ -393,7 +634,7 @@ class LightManager(QObject):
             str: Group ID if successful, None otherwise
         """
         # Generate a new group ID
-        group_id = str(uuid.uuid4())
+        group_id = uuid.uuid4().hex
         
         # Create group info
         group_info = {
@@ -404,7 +645,7 @@ class LightManager(QObject):
         
         # Save to configuration
         if self.config_manager.add_group(group_info):
-            self.devices_updated.emit()
+            self._queue_devices_updated()
             return group_id
         
         return None
@@ -422,8 +663,7 @@ class LightManager(QObject):
             bool: True if successful, False otherwise
         """
         # Get existing group
-        groups = self.config_manager.get_groups()
-        group = next((g for g in groups if g['id'] == group_id), None)
+        group = self.config_manager.get_group(group_id)
         
         if not group:
             logger.error(f"Cannot find group {group_id}")
@@ -438,7 +678,7 @@ class LightManager(QObject):
         
         # Save to configuration
         if self.config_manager.add_group(group):
-            self.devices_updated.emit()
+            self._queue_devices_updated()
             return True
         
         return False
@@ -454,7 +694,7 @@ class LightManager(QObject):
             bool: True if successful, False otherwise
         """
         if self.config_manager.remove_group(group_id):
-            self.devices_updated.emit()
+            self._queue_devices_updated()
             return True
         
         return False
@@ -471,22 +711,16 @@ class LightManager(QObject):
             bool: True if successful for all lights, False otherwise
         """
         # Get group
-        groups = self.config_manager.get_groups()
-        group = next((g for g in groups if g['id'] == group_id), None)
+        group = self.config_manager.get_group(group_id)
         
         if not group or 'lights' not in group:
             logger.error(f"Cannot find group {group_id} or group has no lights")
             return False
         
-        # Set state for each light in the group
-        success = True
-        
-        for light_info in group['lights']:
-            protocol, light_id = light_info
-            if not self.set_light_state(protocol, light_id, state):
-                success = False
-        
-        return success
+        # Set state for all lights in the group at once
+        return self.set_many([
+            (protocol, light_id, state) for protocol, light_id in group['lights']
+        ])
     
     def get_connected_device_count(self):
         """
@@ -495,19 +729,7 @@ class LightManager(QObject):
         Returns:
             int: Number of connected devices
         """
-        count = 0
-        
-        # Count Hue lights
-        for light in self.hue_lights.values():
-            if light.get('state', {}).get('reachable', False):
-                count += 1
-        
-        # Count LIFX lights
-        for light in self.lifx_lights.values():
-            if light.get('state', {}).get('reachable', False):
-                count += 1
-        
-        return count
+        return self._reachable_count
     
     def get_total_device_count(self):
         """
@@ -516,4 +738,148 @@ class LightManager(QObject):
         Returns:
             int: Total number of devices
         """
-        return len(self.hue_lights) + len(self.lifx_lights)
+        return self._total_count
+    
+    def _store_light(self, protocol, light_id, light_info):
+        """
+        Add a light, or merge into an existing one, and update the device counts
+        
+        Must be called with the write lock held.
+        
+        Args:
+            protocol: Light protocol ('hue' or 'lifx')
+            light_id: Light identifier
+            light_info: Light information
+            
+        Returns:
+            dict: The stored light information
+        """
+        lights = self._lights_by_protocol[protocol]
+        light = lights.get(light_id)
+        added = light is None
+        if added:
+            self._total_count += 1
+            light = lights[light_id] = light_info
+        else:
+            if light.get('state', {}).get('reachable', False):
+                self._reachable_count -= 1
+            light.update(light_info)
+        
+        if light.get('state', {}).get('reachable', False):
+            self._reachable_count += 1
+        
+        self._queue_device_change(protocol, light_id, light, added)
+        return light
+    
+    def _apply_state(self, light, state):
+        """
+        Merge new state values into a light and update the reachable count
+        
+        Must be called with the write lock held.
+        
+        Args:
+            light: Light information
+            state: Normalized state values
+        """
+        light_state = light.setdefault('state', {})
+        was_reachable = light_state.get('reachable', False)
+        light_state.update(state)
+        
+        if light_state.get('reachable', False) != was_reachable:
+            self._reachable_count += -1 if was_reachable else 1
+    
+    def _commit_state(self, protocol, light_id, light, state):
+        """
+        Store new state values for a light and queue a UI notification
+        
+        Args:
+            protocol: Light protocol ('hue' or 'lifx')
+            light_id: Light identifier
+            light: Light information
+            state: Normalized state values
+        """
+        with self.lock.write():
+            self._apply_state(light, state)
+        
+        self._queue_state_update(protocol, light_id, light)
+    
+    def _queue_state_update(self, protocol, light_id, state):
+        """
+        Queue a light state change for the next batched notification
+        
+        Args:
+            protocol: Light protocol ('hue' or 'lifx')
+            light_id: Light identifier
+            state: New light state
+        """
+        with self._pending_lock:
+            self._pending_state_updates[(protocol, light_id)] = state
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        
+        if schedule:
+            self._flush_requested.emit()
+    
+    def _queue_devices_updated(self):
+        """Queue a device list change for the next batched notification"""
+        with self._pending_lock:
+            self._pending_devices_updated = True
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        
+        if schedule:
+            self._flush_requested.emit()
+    
+    def _queue_device_change(self, protocol, light_id, light, added):
+        """
+        Record an added or changed light for the next device list notification
+        
+        Args:
+            protocol: Light protocol ('hue' or 'lifx')
+            light_id: Light identifier
+            light: Light information
+            added: True if the light is new, False if it was updated
+        """
+        key = (protocol, light_id)
+        with self._pending_lock:
+            # A light added and then updated in the same window is still new
+            previous = self._pending_device_changes.get(key)
+            kind = 'added' if added or (previous and previous[0] == 'added') else 'changed'
+            self._pending_device_changes[key] = (kind, light)
+        
+        self._queue_devices_updated()
+    
+    @Slot()
+    def _start_update_timer(self):
+        """Start the update timer for a newly scheduled flush"""
+        self._update_timer.start()
+    
+    @Slot()
+    def _flush_updates(self):
+        """Emit all queued notifications at once"""
+        with self._pending_lock:
+            updates = self._pending_state_updates
+            devices_updated = self._pending_devices_updated
+            device_changes = self._pending_device_changes
+            self._pending_state_updates = {}
+            self._pending_devices_updated = False
+            self._pending_device_changes = {}
+            self._flush_scheduled = False
+        
+        if updates:
+            self.states_changed_bulk.emit([
+                (protocol, light_id, state)
+                for (protocol, light_id), state in updates.items()
+            ])
+        
+        if devices_updated:
+            changes = {'added': [], 'changed': []}
+            for (protocol, light_id), (kind, light) in device_changes.items():
+                changes[kind].append((protocol, light_id, light))
+            self.devices_updated.emit(changes)
+        
+        # Announce device counts only when they actually changed
+        status = (self._reachable_count, self._total_count)
+        if status != self._last_device_status:
+            self._last_device_status = status
+            self.device_status_changed.emit(*status)
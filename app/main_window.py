@@ -7,13 +7,15 @@ import sys
 from PySide6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QMessageBox, QMenu, QToolBar,
-    QStatusBar, QSplitter, QScrollArea, QFrame
+    QStatusBar, QSplitter, QScrollArea, QFrame, QTreeView, QAbstractItemView
 )
-from PySide6.QtCore import Qt, QTimer, QSize, Slot, Signal
-from PySide6.QtGui import QIcon, QAction, QKeySequence
+from PySide6.QtCore import (
+    Qt, QTimer, QSize, QThreadPool, QModelIndex, QByteArray, Slot, Signal
+)
+from PySide6.QtGui import QIcon, QAction, QKeySequence, QStandardItemModel, QStandardItem
 
 from .constants import APP_NAME, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT
-from .light_manager import LightManager
+from .light_manager import AddDeviceRunnable, LightManager
 from .discovery_service import DiscoveryService
 from .scheduler import SchedulerService
 from .settings_dialog import SettingsDialog
@@ -26,6 +28,15 @@ from .ui.icons import get_icon
 
 logger = logging.getLogger(APP_NAME)
 
+# Contents of the About dialog
+_ABOUT_TITLE = f"About {APP_NAME}"
+_ABOUT_HTML = (
+    f"<h2>{APP_NAME}</h2>"
+    "<p>A Windows desktop application for controlling multiple brands of smart lights.</p>"
+    "<p>Supports Philips Hue and LIFX smart lighting systems.</p>"
+    "<p>© 2023 Smart Light Controller Project</p>"
+)
+
 
 class MainWindow(QMainWindow):
     """
@@ -42,14 +53,10 @@ class MainWindow(QMainWindow):
         # Initialize UI
         self.init_ui()
         
-        # Set up timers for periodic updates
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(5000)  # Update status every 5 seconds
-        
         # Auto-discover devices if configured
         if self.config_manager.get_setting('discover_on_startup', True):
-            QTimer.singleShot(500, self.discover_devices)
+            # Start as soon as the event loop is running
+            QTimer.singleShot(0, self.discover_devices)
     
     def init_ui(self):
         """Initialize the user interface components"""
@@ -57,20 +64,25 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(APP_NAME)
         self.setWindowIcon(get_icon('app'))
         
-        # Set window size from saved config
+        # Restore window geometry from saved config
         window_settings = self.config_manager.get_window_settings()
-        self.resize(
-            window_settings.get('width', DEFAULT_WINDOW_WIDTH),
-            window_settings.get('height', DEFAULT_WINDOW_HEIGHT)
-        )
-        
-        # Set window position if saved
-        if window_settings.get('position_x') and window_settings.get('position_y'):
-            self.move(window_settings['position_x'], window_settings['position_y'])
-        
-        # Maximize if that was the last state
-        if window_settings.get('maximized', False):
-            self.showMaximized()
+        geometry = window_settings.get('geometry')
+        if not geometry or not self.restoreGeometry(
+            QByteArray.fromBase64(geometry.encode('ascii'))
+        ):
+            # Fall back to the size and position saved by older versions
+            self.resize(
+                window_settings.get('width', DEFAULT_WINDOW_WIDTH),
+                window_settings.get('height', DEFAULT_WINDOW_HEIGHT)
+            )
+            
+            # Set window position if saved
+            if window_settings.get('position_x') and window_settings.get('position_y'):
+                self.move(window_settings['position_x'], window_settings['position_y'])
+            
+            # Maximize if that was the last state
+            if window_settings.get('maximized', False):
+                self.showMaximized()
         
         # Create central widget and layout
         self.central_widget = QWidget()
@@ -91,6 +103,18 @@ class MainWindow(QMainWindow):
         self.left_panel = QWidget()
         self.left_layout = QVBoxLayout(self.left_panel)
         
+        # Device list, updated incrementally from light manager change sets
+        self.device_model = QStandardItemModel(0, 2, self)
+        self.device_model.setHorizontalHeaderLabels(["Device", "Protocol"])
+        self._device_items = {}  # (protocol, light ID) -> name item
+        
+        self.device_tree = QTreeView()
+        self.device_tree.setModel(self.device_model)
+        self.device_tree.setRootIsDecorated(False)
+        self.device_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.device_tree.selectionModel().currentChanged.connect(self.handle_device_selected)
+        self.left_layout.addWidget(self.device_tree)
+        
         # Right panel - control area
         self.right_panel = QScrollArea()
         self.right_panel.setWidgetResizable(True)
@@ -110,13 +134,37 @@ class MainWindow(QMainWindow):
         self.groups_tab = QWidget()
         self.schedules_tab = QWidget()
         
+        # Group and schedule widgets are built the first time their tab is shown
+        self.group_widget = None
+        self.schedule_widget = None
+        
         self.setup_devices_tab()
-        self.setup_groups_tab()
-        self.setup_schedules_tab()
         
         self.tab_widget.addTab(self.devices_tab, get_icon('lightbulb'), "Devices")
-        self.tab_widget.addTab(self.groups_tab, get_icon('group'), "Groups")
-        self.tab_widget.addTab(self.schedules_tab, get_icon('schedule'), "Schedules")
+        groups_index = self.tab_widget.addTab(self.groups_tab, get_icon('group'), "Groups")
+        schedules_index = self.tab_widget.addTab(
+            self.schedules_tab, get_icon('schedule'), "Schedules"
+        )
+        
+        self._lazy_tab_builders = {
+            groups_index: self.setup_groups_tab,
+            schedules_index: self.setup_schedules_tab
+        }
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        
+        # Collapse group widget refreshes requested during one event loop pass
+        self._group_refresh_timer = QTimer(self)
+        self._group_refresh_timer.setSingleShot(True)
+        self._group_refresh_timer.setInterval(0)
+        self._group_refresh_timer.timeout.connect(self._refresh_group_widget)
+        
+        # Discovery results are summarized in at most one status message per interval
+        self._discovered_count = 0
+        self._discovered_last_name = ''
+        self._discovery_status_timer = QTimer(self)
+        self._discovery_status_timer.setSingleShot(True)
+        self._discovery_status_timer.setInterval(200)  # milliseconds
+        self._discovery_status_timer.timeout.connect(self._show_discovery_status)
         
         # Status Bar
         self.status_bar = StatusBar()
@@ -125,6 +173,11 @@ class MainWindow(QMainWindow):
         # Connect signals to slots
         self.connect_signals()
         
+        # Restore toolbar and dock layout now that they exist
+        state = window_settings.get('state')
+        if state:
+            self.restoreState(QByteArray.fromBase64(state.encode('ascii')))
+        
         # Load devices from configuration
         self.load_saved_devices()
     
@@ -163,9 +216,7 @@ class MainWindow(QMainWindow):
         toggle_toolbar_action = QAction("Show &Toolbar", self)
         toggle_toolbar_action.setCheckable(True)
         toggle_toolbar_action.setChecked(True)
-        toggle_toolbar_action.triggered.connect(
-            lambda checked: self.toolbar.setVisible(checked)
-        )
+        toggle_toolbar_action.triggered.connect(self.toolbar.setVisible)
         view_menu.addAction(toggle_toolbar_action)
         
         # Help menu
@@ -178,6 +229,7 @@ class MainWindow(QMainWindow):
     def create_toolbar(self):
         """Create the toolbar with quick actions"""
         self.toolbar = QToolBar("Main Toolbar")
+        self.toolbar.setObjectName("main_toolbar")  # Required by saveState()
         self.toolbar.setIconSize(QSize(24, 24))
         self.toolbar.setMovable(False)
         self.addToolBar(self.toolbar)
@@ -194,11 +246,11 @@ class MainWindow(QMainWindow):
         self.toolbar.addSeparator()
         
         all_on_action = QAction(get_icon('bulb_on'), "All On", self)
-        all_on_action.triggered.connect(lambda: self.light_manager.set_all_lights(True))
+        all_on_action.triggered.connect(self.all_lights_on)
         self.toolbar.addAction(all_on_action)
         
         all_off_action = QAction(get_icon('bulb_off'), "All Off", self)
-        all_off_action.triggered.connect(lambda: self.light_manager.set_all_lights(False))
+        all_off_action.triggered.connect(self.all_lights_off)
         self.toolbar.addAction(all_off_action)
         
         self.toolbar.addSeparator()
@@ -237,22 +289,12 @@ class MainWindow(QMainWindow):
         layout.addWidget(instructions)
         
         # Group management controls
-        group_controls = QHBoxLayout()
-        
-        create_group_btn = QPushButton(get_icon('add'), "Create Group")
-        create_group_btn.clicked.connect(self.create_new_group)
-        group_controls.addWidget(create_group_btn)
-        
-        edit_group_btn = QPushButton(get_icon('edit'), "Edit Group")
-        edit_group_btn.clicked.connect(self.edit_selected_group)
-        group_controls.addWidget(edit_group_btn)
-        
-        delete_group_btn = QPushButton(get_icon('delete'), "Delete Group")
-        delete_group_btn.clicked.connect(self.delete_selected_group)
-        group_controls.addWidget(delete_group_btn)
-        
-        group_controls.addStretch(1)
-        layout.addLayout(group_controls)
+        layout.addLayout(self._build_crud_bar(
+            "Group",
+            self.create_new_group,
+            self.edit_selected_group,
+            self.delete_selected_group
+        ))
         
         # Group control widget
         self.group_widget = LightGroupWidget(self.light_manager, self.config_manager)
@@ -273,22 +315,12 @@ class MainWindow(QMainWindow):
         layout.addWidget(instructions)
         
         # Schedule management controls
-        schedule_controls = QHBoxLayout()
-        
-        create_schedule_btn = QPushButton(get_icon('add'), "Create Schedule")
-        create_schedule_btn.clicked.connect(self.create_new_schedule)
-        schedule_controls.addWidget(create_schedule_btn)
-        
-        edit_schedule_btn = QPushButton(get_icon('edit'), "Edit Schedule")
-        edit_schedule_btn.clicked.connect(self.edit_selected_schedule)
-        schedule_controls.addWidget(edit_schedule_btn)
-        
-        delete_schedule_btn = QPushButton(get_icon('delete'), "Delete Schedule")
-        delete_schedule_btn.clicked.connect(self.delete_selected_schedule)
-        schedule_controls.addWidget(delete_schedule_btn)
-        
-        schedule_controls.addStretch(1)
-        layout.addLayout(schedule_controls)
+        layout.addLayout(self._build_crud_bar(
+            "Schedule",
+            self.create_new_schedule,
+            self.edit_selected_schedule,
+            self.delete_selected_schedule
+        ))
         
         # Schedule widget
         self.schedule_widget = ScheduleWidget(
@@ -299,52 +331,173 @@ class MainWindow(QMainWindow):
         # Stretch to fill available space
         layout.addStretch(1)
     
+    def _build_crud_bar(self, kind, create_slot, edit_slot, delete_slot):
+        """
+        Build a row of create/edit/delete buttons
+        
+        Args:
+            kind: Name of the item type shown on the buttons (e.g. "Group")
+            create_slot: Slot called by the create button
+            edit_slot: Slot called by the edit button
+            delete_slot: Slot called by the delete button
+            
+        Returns:
+            QHBoxLayout: Layout containing the buttons
+        """
+        controls = QHBoxLayout()
+        
+        for icon, label, slot in (
+            ('add', f"Create {kind}", create_slot),
+            ('edit', f"Edit {kind}", edit_slot),
+            ('delete', f"Delete {kind}", delete_slot)
+        ):
+            button = QPushButton(get_icon(icon), label)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        
+        controls.addStretch(1)
+        return controls
+    
     def connect_signals(self):
         """Connect signals to slots for event handling"""
-        # Connect light manager signals
-        self.light_manager.devices_updated.connect(self.update_device_list)
-        self.light_manager.light_state_changed.connect(self.handle_light_state_change)
-        
-        # Connect discovery service signals
+        # Light manager signals. The bulk update signals are emitted by the
+        # coalescing timer on this thread, so they are delivered directly;
+        # lights_added comes from device worker threads and must be queued.
+        self.light_manager.devices_updated.connect(
+            self.update_device_list, Qt.DirectConnection)
+        self.light_manager.states_changed_bulk.connect(
+            self.handle_light_states_changed, Qt.DirectConnection)
+        self.light_manager.device_status_changed.connect(
+            self.status_bar.update_device_status, Qt.DirectConnection)
+        self.light_manager.lights_added.connect(
+            self.handle_lights_added, Qt.QueuedConnection)
+        
+        # Discovery service signals are all emitted from the discovery
+        # runnable on the thread pool, so they are queued to this thread
         self.discovery_service.discovery_started.connect(
-            lambda: self.status_bar.show_message("Discovering devices...")
-        )
+            self.handle_discovery_started, Qt.QueuedConnection)
         self.discovery_service.discovery_finished.connect(
-            lambda success: self.status_bar.show_message(
-                "Device discovery completed" if success else "Device discovery failed"
-            )
-        )
-        self.discovery_service.device_discovered.connect(
-            lambda protocol, device: self.status_bar.show_message(
-                f"Discovered {protocol} device: {device.get('name', 'Unknown')}"
-            )
-        )
+            self.handle_discovery_finished, Qt.QueuedConnection)
+        self.discovery_service.devices_discovered.connect(
+            self.handle_devices_discovered, Qt.QueuedConnection)
     
     def load_saved_devices(self):
         """Load devices from saved configuration"""
+        # Connect to every saved device concurrently, off the GUI thread;
+        # the light manager pushes the results back through its signals
+        pool = QThreadPool.globalInstance()
+        
         # Load Hue bridges
         for bridge in self.config_manager.get_devices('hue'):
-            self.light_manager.add_hue_bridge(bridge)
+            pool.start(AddDeviceRunnable('hue', bridge, self.light_manager))
         
         # Load LIFX lights
         for light in self.config_manager.get_devices('lifx'):
-            self.light_manager.add_lifx_light(light)
+            pool.start(AddDeviceRunnable('lifx', light, self.light_manager))
+        
+        # Show initial device counts; later changes are pushed by the light manager
+        self.update_status()
     
-    @Slot()
-    def update_device_list(self):
-        """Update the device list in the UI when devices change"""
-        # This would update the device tree in the left panel
-        # For now, just show a status message
+    @Slot(dict)
+    def update_device_list(self, changes):
+        """
+        Update the device list with the devices that were added or changed
+        
+        Args:
+            changes: Dictionary with 'added' and 'changed' lists of
+                (protocol, light ID, light info) tuples
+        """
+        for kind in ('added', 'changed'):
+            for protocol, light_id, light in changes.get(kind, ()):
+                name = light.get('name', light_id)
+                item = self._device_items.get((protocol, light_id))
+                
+                if item is None:
+                    item = QStandardItem(name)
+                    item.setData((protocol, light_id), Qt.UserRole)
+                    self.device_model.appendRow([item, QStandardItem(protocol)])
+                    self._device_items[(protocol, light_id)] = item
+                elif item.text() != name:
+                    item.setText(name)
+        
         self.status_bar.show_message("Devices updated")
     
-    @Slot(str, str, dict)
-    def handle_light_state_change(self, protocol, light_id, state):
-        """Handle light state changes to update UI"""
+    @Slot(QModelIndex, QModelIndex)
+    def handle_device_selected(self, current, previous):
+        """Show the controls for the device selected in the device list"""
+        item = self.device_model.item(current.row(), 0)
+        if item is None:
+            return
+        
+        protocol, light_id = item.data(Qt.UserRole)
+        self.device_control_widget.set_light(protocol, light_id)
+        self.tab_widget.setCurrentWidget(self.devices_tab)
+    
+    @Slot()
+    def handle_discovery_started(self):
+        """Show a status message when device discovery starts"""
+        self.status_bar.show_message("Discovering devices...")
+    
+    @Slot(bool)
+    def handle_discovery_finished(self, success):
+        """Show a status message when device discovery finishes"""
+        self.status_bar.show_message(
+            "Device discovery completed" if success else "Device discovery failed"
+        )
+    
+    @Slot(str, list)
+    def handle_devices_discovered(self, protocol, devices):
+        """Record discovered devices for the next throttled status message"""
+        self._discovered_count += len(devices)
+        self._discovered_last_name = devices[-1].name
+        
+        if not self._discovery_status_timer.isActive():
+            self._discovery_status_timer.start()
+    
+    @Slot()
+    def _show_discovery_status(self):
+        """Show a single status message summarizing recently discovered devices"""
+        if self._discovered_count == 1:
+            self.status_bar.show_message(f"Discovered device: {self._discovered_last_name}")
+        else:
+            self.status_bar.show_message(
+                f"Discovered {self._discovered_count} devices "
+                f"(latest: {self._discovered_last_name})"
+            )
+        
+        self._discovered_count = 0
+        self._discovered_last_name = ''
+    
+    @Slot(list)
+    def handle_light_states_changed(self, updates):
+        """Handle a batch of light state changes to update UI"""
         # Update device control widget if the currently selected light changed
-        self.device_control_widget.update_if_match(protocol, light_id)
+        for protocol, light_id, _ in updates:
+            self.device_control_widget.update_if_match(protocol, light_id)
         
-        # Update group widget to reflect light state changes
-        self.group_widget.update_light_states()
+        # Schedule a single group widget refresh
+        self._group_refresh_timer.start()
+    
+    @Slot(str, dict)
+    def handle_lights_added(self, protocol, lights):
+        """Handle a batch of lights added from a bridge"""
+        for light_id in lights:
+            self.device_control_widget.update_if_match(protocol, light_id)
+        
+        self._group_refresh_timer.start()
+    
+    @Slot(int)
+    def _on_tab_changed(self, index):
+        """Build a tab's contents the first time it is shown"""
+        builder = self._lazy_tab_builders.pop(index, None)
+        if builder is not None:
+            builder()
+    
+    @Slot()
+    def _refresh_group_widget(self):
+        """Refresh light states in the group widget once it has been built"""
+        if self.group_widget is not None:
+            self.group_widget.update_light_states()
     
     @Slot()
     def discover_devices(self):
@@ -354,9 +507,20 @@ class MainWindow(QMainWindow):
     @Slot()
     def refresh_devices(self):
         """Refresh the status of existing devices"""
-        self.light_manager.refresh_all_devices()
+        # Refresh off the GUI thread; results arrive through light manager signals
+        QThreadPool.globalInstance().start(self.light_manager.refresh_all_devices)
         self.status_bar.show_message("Refreshing all devices...")
     
+    @Slot()
+    def all_lights_on(self):
+        """Turn all lights on"""
+        self.light_manager.set_all_lights(True)
+    
+    @Slot()
+    def all_lights_off(self):
+        """Turn all lights off"""
+        self.light_manager.set_all_lights(False)
+    
     @Slot()
     def create_new_group(self):
         """Create a new light group"""
@@ -399,18 +563,11 @@ class MainWindow(QMainWindow):
     @Slot()
     def show_about(self):
         """Show about dialog with application information"""
-        QMessageBox.about(
-            self,
-            f"About {APP_NAME}",
-            f"<h2>{APP_NAME}</h2>"
-            "<p>A Windows desktop application for controlling multiple brands of smart lights.</p>"
-            "<p>Supports Philips Hue and LIFX smart lighting systems.</p>"
-            "<p>© 2023 Smart Light Controller Project</p>"
-        )
+        QMessageBox.about(self, _ABOUT_TITLE, _ABOUT_HTML)
     
     @Slot()
     def update_status(self):
-        """Periodic status update for devices"""
+        """Refresh the device status from the light manager's current counts"""
         connected_count = self.light_manager.get_connected_device_count()
         total_count = self.light_manager.get_total_device_count()
         
@@ -423,19 +580,16 @@ class MainWindow(QMainWindow):
         """Handle window close event to save settings"""
         # Save window state
         window_settings = {
-            'maximized': self.isMaximized(),
-            'width': self.width(),
-            'height': self.height(),
-            'position_x': self.x(),
-            'position_y': self.y()
+            'geometry': bytes(self.saveGeometry().toBase64()).decode('ascii'),
+            'state': bytes(self.saveState().toBase64()).decode('ascii'),
+            'maximized': self.isMaximized()
         }
         self.config_manager.update_window_settings(window_settings)
         
-        # Save configuration
-        self.config_manager.save_config()
+        # The configuration is written once by main() after the event loop exits
         
-        # Stop scheduler
-        self.scheduler_service.stop()
+        # Signal the scheduler to stop without waiting for its thread to exit
+        self.scheduler_service.stop(wait=False)
         
         # Accept the close event
         event.accept()
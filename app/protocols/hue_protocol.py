@@ -5,20 +5,54 @@ Philips Hue protocol implementation
 import logging
 import json
 import time
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library decoder
+    orjson = None
 
 from ..constants import (
     APP_NAME, ATTR_BRIGHTNESS, ATTR_COLOR_TEMP, ATTR_HUE, 
     ATTR_SATURATION, ATTR_RGB_COLOR, HUE_BRIDGE_DISCOVERY_URL,
-    NETWORK_TIMEOUT, HUE_RANGE, SATURATION_RANGE, BRIGHTNESS_RANGE
+    NETWORK_TIMEOUT, NETWORK_CONNECT_TIMEOUT, HUE_RANGE, SATURATION_RANGE, BRIGHTNESS_RANGE,
+    HUE_POOL_CONNECTIONS, HUE_POOL_MAXSIZE, HUE_STATE_CACHE_TTL
 )
 from .protocol_base import ProtocolBase
-from .utils import rgb_to_xy, xy_to_rgb
+from .utils import rgb_to_xy, rgb_to_xy_batch, xy_to_rgb
 
 
 logger = logging.getLogger(APP_NAME)
 
+# (connect, read) timeouts for bridge requests; an unreachable bridge fails
+# fast on connect while slow responses still get the full read timeout
+_TIMEOUT = (NETWORK_CONNECT_TIMEOUT, NETWORK_TIMEOUT)
+
+# JSON decoder for bridge responses
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Headers for request bodies encoded with _json_dumps
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _json_dumps(obj):
+    """Encode a request body as JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+# Scale factors between Hue API ranges and generic percent/degree values
+_BRI_TO_PCT = 100.0 / BRIGHTNESS_RANGE[1]
+_PCT_TO_BRI = BRIGHTNESS_RANGE[1] / 100.0
+_HUE_TO_DEG = 360.0 / HUE_RANGE[1]
+_DEG_TO_HUE = HUE_RANGE[1] / 360.0
+_SAT_TO_PCT = 100.0 / SATURATION_RANGE[1]
+_PCT_TO_SAT = SATURATION_RANGE[1] / 100.0
+
 
 class HueProtocol(ProtocolBase):
     """
@@ -26,6 +60,65 @@ class HueProtocol(ProtocolBase):
     Handles communication with Hue bridges and light bulbs
     """
     
+    def __init__(self):
+        """Initialize the protocol with a pooled HTTP session"""
+        # Reuse TCP connections to the bridges instead of reconnecting on
+        # every request. Connection failures are retried for any request,
+        # but read and status retries only cover idempotent methods, so user
+        # creation (POST) is never repeated once the bridge has received it.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HUE_POOL_CONNECTIONS,
+            pool_maxsize=HUE_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=2, connect=2, read=1, backoff_factor=0.25,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["GET", "PUT"]
+            )
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # (bridge IP, username) -> API base URL
+        self._url_cache = {}
+        
+        # (bridge IP, username) -> (ETag, raw lights data) from the last light listing
+        self._lights_cache = {}
+        
+        # (bridge IP, light ID) -> (monotonic time, generic state last written)
+        self._last_state = {}
+    
+    def _base(self, bridge_ip, username):
+        """
+        Get the API base URL for a bridge user, building it only once
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            
+        Returns:
+            str: Base URL of the bridge API for the user
+        """
+        key = (bridge_ip, username)
+        base = self._url_cache.get(key)
+        if base is None:
+            base = self._url_cache[key] = f"http://{bridge_ip}/api/{username}"
+        return base
+    
+    def _light_state_url(self, bridge_ip, username, light_id):
+        """
+        Get the state URL of a Hue light, the target of every light write
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            light_id: Light identifier
+            
+        Returns:
+            str: URL of the light's state endpoint
+        """
+        return f"{self._base(bridge_ip, username)}/lights/{light_id}/state"
+    
     def discover_bridges(self, timeout=NETWORK_TIMEOUT):
         """
         Discover Hue bridges on the network
@@ -38,61 +131,71 @@ class HueProtocol(ProtocolBase):
         """
         bridges = []
         
+        # Method 1: Use Philips discovery service
+        logger.info("Discovering Hue bridges via Philips discovery service")
+        try:
+            response = self._session.get(
+                HUE_BRIDGE_DISCOVERY_URL,
+                timeout=(min(NETWORK_CONNECT_TIMEOUT, timeout), timeout)
+            )
+            if response.status_code == 200:
+                for bridge in _json_loads(response.content):
+                    if 'internalipaddress' in bridge:
+                        bridges.append({
+                            'id': bridge.get('id', ''),
+                            'ip': bridge['internalipaddress'],
+                            'name': 'Philips Hue Bridge'
+                        })
+        except (RequestException, ValueError) as e:
+            logger.warning(f"Error using Philips discovery service: {str(e)}")
+        
+        # Method 2: Try mDNS/UPnP discovery if no bridges found
+        if not bridges:
+            # In a real implementation, we would use additional discovery methods here
+            # Such as mDNS/Bonjour or UPnP
+            logger.info("No bridges found via Philips discovery, would try mDNS/UPnP here")
+        
+        # Get more information for all bridges concurrently, so one
+        # unreachable bridge costs a single timeout rather than one each
+        if bridges:
+            self.submit_many(self._enrich_bridge, ((bridge, timeout) for bridge in bridges))
+        
+        logger.info(f"Discovered {len(bridges)} Hue bridge(s)")
+        return bridges
+    
+    def _enrich_bridge(self, bridge, timeout=NETWORK_TIMEOUT):
+        """
+        Add name, model and firmware details to a discovered bridge in place
+        
+        Args:
+            bridge: Bridge dictionary from discovery
+            timeout: Request timeout in seconds
+        """
         try:
-            # Method 1: Use Philips discovery service
-            try:
-                logger.info("Discovering Hue bridges via Philips discovery service")
-                response = requests.get(
-                    HUE_BRIDGE_DISCOVERY_URL,
-                    timeout=timeout
+            if 'ip' in bridge:
+                # Get bridge info from the API
+                response = self._session.get(
+                    f"http://{bridge['ip']}/api/config",
+                    timeout=(min(NETWORK_CONNECT_TIMEOUT, timeout), timeout)
                 )
                 if response.status_code == 200:
-                    for bridge in response.json():
-                        if 'internalipaddress' in bridge:
-                            bridges.append({
-                                'id': bridge.get('id', ''),
-                                'ip': bridge['internalipaddress'],
-                                'name': 'Philips Hue Bridge'
-                            })
-            except (RequestException, ValueError) as e:
-                logger.warning(f"Error using Philips discovery service: {str(e)}")
-            
-            # Method 2: Try mDNS/UPnP discovery if no bridges found
-            if not bridges:
-                # In a real implementation, we would use additional discovery methods here
-                # Such as mDNS/Bonjour or UPnP
-                logger.info("No bridges found via Philips discovery, would try mDNS/UPnP here")
-            
-            # For each bridge, try to get more information
-            for bridge in bridges:
-                try:
-                    if 'ip' in bridge:
-                        # Get bridge info from the API
-                        response = requests.get(
-                            f"http://{bridge['ip']}/api/config",
-                            timeout=timeout
-                        )
-                        if response.status_code == 200:
-                            bridge_info = response.json()
-                            # Update bridge information
-                            if 'name' in bridge_info:
-                                bridge['name'] = bridge_info['name']
-                            if 'bridgeid' in bridge_info and 'id' not in bridge:
-                                bridge['id'] = bridge_info['bridgeid']
-                            if 'modelid' in bridge_info:
-                                bridge['model'] = bridge_info['modelid']
-                            if 'swversion' in bridge_info:
-                                bridge['firmware'] = bridge_info['swversion']
-                            bridge['manufacturer'] = 'Philips Hue'
-                except RequestException as e:
-                    logger.warning(f"Error getting info for bridge at {bridge.get('ip')}: {str(e)}")
-            
-            logger.info(f"Discovered {len(bridges)} Hue bridge(s)")
-            return bridges
-            
+                    bridge_info = _json_loads(response.content)
+                    # Update bridge information
+                    if 'name' in bridge_info:
+                        bridge['name'] = bridge_info['name']
+                    if 'bridgeid' in bridge_info and 'id' not in bridge:
+                        bridge['id'] = bridge_info['bridgeid']
+                    if 'modelid' in bridge_info:
+                        bridge['model'] = bridge_info['modelid']
+                    if 'swversion' in bridge_info:
+                        bridge['firmware'] = bridge_info['swversion']
+                    bridge['manufacturer'] = 'Philips Hue'
+        except (RequestException, ValueError) as e:
+            logger.warning(f"Error getting info for bridge at {bridge.get('ip')}: {str(e)}")
         except Exception as e:
-            self.handle_error("bridge discovery", e)
-            return []
+            # Runs once per bridge on the discovery pool; contain unexpected
+            # errors so one bridge cannot abort discovery of the others
+            self.handle_error(f"getting info for bridge at {bridge.get('ip')}", e)
     
     def discover_devices(self, timeout=NETWORK_TIMEOUT):
         """
@@ -126,12 +229,12 @@ class HueProtocol(ProtocolBase):
             # Check if we already have a username
             if 'username' in bridge_info:
                 # Try to use existing username
-                response = requests.get(
-                    f"http://{ip}/api/{bridge_info['username']}",
-                    timeout=NETWORK_TIMEOUT
+                response = self._session.get(
+                    self._base(ip, bridge_info['username']),
+                    timeout=_TIMEOUT
                 )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _json_loads(response.content)
                     if not isinstance(data, list) or 'error' not in data[0]:
                         logger.info(f"Connected to Hue bridge at {ip} with existing credentials")
                         return True
@@ -145,14 +248,15 @@ class HueProtocol(ProtocolBase):
             # This would normally wait for user confirmation that the button was pressed
             # For demo purposes, we'll just try to create a user
             
-            response = requests.post(
+            response = self._session.post(
                 f"http://{ip}/api",
-                json={"devicetype": "smart_light_controller#windows"},
-                timeout=NETWORK_TIMEOUT
+                data=_json_dumps({"devicetype": "smart_light_controller#windows"}),
+                headers=_JSON_HEADERS,
+                timeout=_TIMEOUT
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if isinstance(data, list) and 'success' in data[0]:
                     username = data[0]['success']['username']
                     logger.info(f"Created new user for Hue bridge: {username}")
@@ -182,34 +286,36 @@ class HueProtocol(ProtocolBase):
         Returns:
             dict: Dictionary of lights (ID -> light info)
         """
+        key = (bridge_ip, username)
+        
         try:
-            response = requests.get(
-                f"http://{bridge_ip}/api/{username}/lights",
-                timeout=NETWORK_TIMEOUT
+            # Ask the bridge to skip the body if the lights have not changed
+            cached = self._lights_cache.get(key)
+            headers = {'If-None-Match': cached[0]} if cached else None
+            
+            response = self._session.get(
+                f"{self._base(bridge_ip, username)}/lights",
+                headers=headers,
+                timeout=_TIMEOUT
             )
             
+            if response.status_code == 304 and cached:
+                logger.debug(f"Hue lights at {bridge_ip} unchanged, reusing previous listing")
+                return self._build_lights(cached[1])
+            
             if response.status_code == 200:
-                lights_data = response.json()
+                self._forget_bridge_states(bridge_ip)
+                lights_data = _json_loads(response.content)
+                lights = self._build_lights(lights_data)
                 
-                # Process lights data
-                lights = {}
-                for light_id, light_data in lights_data.items():
-                    # Convert to standardized format
-                    normalized = {
-                        'id': light_id,
-                        'name': light_data.get('name', f'Light {light_id}'),
-                        'type': light_data.get('type', 'Unknown'),
-                        'model': light_data.get('modelid', 'Unknown'),
-                        'manufacturer': light_data.get('manufacturername', 'Philips Hue'),
-                        'protocol': 'hue'
-                    }
-                    
-                    # Add state information
-                    state = light_data.get('state', {})
-                    normalized_state = self.normalize_state(state)
-                    normalized['state'] = normalized_state
-                    
-                    lights[light_id] = normalized
+                # Keep the raw listing for conditional requests if the bridge
+                # tags it; the built listing is new dicts each time, so the
+                # raw data is never handed out or changed
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._lights_cache[key] = (etag, lights_data)
+                else:
+                    self._lights_cache.pop(key, None)
                 
                 logger.info(f"Retrieved {len(lights)} lights from Hue bridge at {bridge_ip}")
                 return lights
@@ -221,6 +327,30 @@ class HueProtocol(ProtocolBase):
             self.handle_error("getting lights", e)
             return {}
     
+    def _build_lights(self, lights_data):
+        """
+        Convert a raw Hue lights listing to the standardized format
+        
+        Args:
+            lights_data: Lights dictionary as returned by the bridge API
+            
+        Returns:
+            dict: Dictionary of lights (ID -> light info)
+        """
+        normalize_state = self.normalize_state
+        return {
+            light_id: {
+                'id': light_id,
+                'name': light_data.get('name', f'Light {light_id}'),
+                'type': light_data.get('type', 'Unknown'),
+                'model': light_data.get('modelid', 'Unknown'),
+                'manufacturer': light_data.get('manufacturername', 'Philips Hue'),
+                'protocol': 'hue',
+                'state': normalize_state(light_data.get('state', {}))
+            }
+            for light_id, light_data in lights_data.items()
+        }
+    
     def get_light_state(self, bridge_ip, username, light_id):
         """
         Get the current state of a Hue light
@@ -234,13 +364,15 @@ class HueProtocol(ProtocolBase):
             dict: Light state dictionary
         """
         try:
-            response = requests.get(
-                f"http://{bridge_ip}/api/{username}/lights/{light_id}",
-                timeout=NETWORK_TIMEOUT
+            response = self._session.get(
+                f"{self._base(bridge_ip, username)}/lights/{light_id}",
+                timeout=_TIMEOUT
             )
             
             if response.status_code == 200:
-                light_data = response.json()
+                # The light may have been changed elsewhere; forget our writes
+                self._last_state.pop((bridge_ip, light_id), None)
+                light_data = _json_loads(response.content)
                 if 'state' in light_data:
                     return self.normalize_state(light_data['state'])
             
@@ -264,31 +396,206 @@ class HueProtocol(ProtocolBase):
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            # Convert state to Hue API format
-            hue_state = self._convert_to_hue_state(state)
+        # Skip the request if the light already has every requested value
+        key = (bridge_ip, light_id)
+        if self._is_current(key, state):
+            return True
+        
+        # Convert state to Hue API format
+        hue_state = self._convert_to_hue_state(state)
+        
+        if not self._put_state(
+            self._light_state_url(bridge_ip, username, light_id),
+            hue_state,
+            "setting light state"
+        ):
+            return False
+        
+        self._remember_state(key, state)
+        return True
+    
+    def set_lights_state(self, bridge_ip, username, light_ids, state, group_id=None):
+        """
+        Set the same state on several lights of one Hue bridge
+        
+        The Hue state body is built once and shared by every request. When
+        group_id is given the lights are known to make up that bridge group,
+        and a single group action is sent so the bridge fans it out itself.
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            light_ids: Light identifiers on the bridge
+            state: State dictionary with values to set
+            group_id: Bridge group containing exactly these lights, if any
+            
+        Returns:
+            bool: True if all lights were set successfully, False otherwise
+        """
+        # Convert state to Hue API format
+        hue_state = self._convert_to_hue_state(state)
+        
+        if group_id is not None:
+            self._forget_bridge_states(bridge_ip)
+            return self._put_state(
+                f"{self._base(bridge_ip, username)}/groups/{group_id}/action",
+                hue_state,
+                "setting group action"
+            )
+        
+        # Send the per-light requests concurrently over the pooled session
+        results = self.submit_many(self._put_state, (
+            (self._light_state_url(bridge_ip, username, light_id), hue_state, "setting light state")
+            for light_id in light_ids
+        ))
+        
+        for light_id, result in zip(light_ids, results):
+            if result:
+                self._remember_state((bridge_ip, light_id), state)
+        
+        return all(results)
+    
+    def set_lights_states(self, bridge_ip, username, light_states):
+        """
+        Set a different state on each of several lights of one Hue bridge
+        
+        RGB colors for all lights are converted to xy in one batch before the
+        requests are sent concurrently.
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            light_states: List of (light_id, state) tuples
+            
+        Returns:
+            list: Success flag for each light, in the same order as light_states
+        """
+        hue_states = []
+        colors = []
+        colored = []
+        for light_id, state in light_states:
+            rgb = state.get(ATTR_RGB_COLOR)
+            if rgb is not None and len(rgb) == 3:
+                state = {key: value for key, value in state.items() if key != ATTR_RGB_COLOR}
+                colors.append(tuple(rgb))
+                colored.append(len(hue_states))
+            hue_states.append(self._convert_to_hue_state(state))
+        
+        for index, xy in zip(colored, rgb_to_xy_batch(colors)):
+            hue_states[index]['xy'] = xy
+        
+        results = self.submit_many(self._put_state, (
+            (self._light_state_url(bridge_ip, username, light_id), hue_state, "setting light state")
+            for (light_id, _), hue_state in zip(light_states, hue_states)
+        ))
+        
+        for (light_id, state), result in zip(light_states, results):
+            if result:
+                self._remember_state((bridge_ip, light_id), state)
+        
+        return results
+    
+    def set_group_action(self, bridge_ip, username, group_id, state):
+        """
+        Set the state of every light in a Hue group with a single request
+        
+        Group 0 is the bridge's built-in group containing all of its lights.
+        
+        Args:
+            bridge_ip: IP address of the bridge
+            username: Bridge username/API key
+            group_id: Group identifier on the bridge
+            state: State dictionary with values to set
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        # Convert state to Hue API format
+        hue_state = self._convert_to_hue_state(state)
+        
+        # The group's members are not tracked here, so forget the whole bridge
+        self._forget_bridge_states(bridge_ip)
+        
+        return self._put_state(
+            f"{self._base(bridge_ip, username)}/groups/{group_id}/action",
+            hue_state,
+            "setting group action"
+        )
+    
+    def _is_current(self, key, state):
+        """
+        Check whether a recent write already gave a light all requested values
+        
+        Args:
+            key: (bridge IP, light ID) tuple
+            state: State dictionary with values to set
+            
+        Returns:
+            bool: True if the request would not change the light
+        """
+        cached = self._last_state.get(key)
+        if cached is None or time.monotonic() - cached[0] >= HUE_STATE_CACHE_TTL:
+            return False
+        
+        prior = cached[1]
+        return all(attr in prior and prior[attr] == value for attr, value in state.items())
+    
+    def _remember_state(self, key, state):
+        """
+        Record values successfully written to a light
+        
+        Args:
+            key: (bridge IP, light ID) tuple
+            state: State dictionary that was set
+        """
+        cached = self._last_state.get(key)
+        prior = cached[1] if cached and time.monotonic() - cached[0] < HUE_STATE_CACHE_TTL else {}
+        self._last_state[key] = (time.monotonic(), {**prior, **state})
+    
+    def _forget_bridge_states(self, bridge_ip):
+        """
+        Forget the recorded writes for every light on a bridge
+        
+        Args:
+            bridge_ip: IP address of the bridge
+        """
+        # Iterate a snapshot; pool threads add and drop entries concurrently
+        for key in list(self._last_state):
+            if key[0] == bridge_ip:
+                self._last_state.pop(key, None)
+    
+    def _put_state(self, url, hue_state, action):
+        """
+        Send a Hue API state body to a light or group endpoint
+        
+        Args:
+            url: Light state or group action URL
+            hue_state: Hue API state dictionary
+            action: Description of the action for error messages
             
-            response = requests.put(
-                f"http://{bridge_ip}/api/{username}/lights/{light_id}/state",
-                json=hue_state,
-                timeout=NETWORK_TIMEOUT
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            response = self._session.put(
+                url, data=_json_dumps(hue_state), headers=_JSON_HEADERS, timeout=_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
-                # Check if there were any errors
-                for item in result:
-                    if 'error' in item:
-                        logger.error(f"Hue API error: {item['error']['description']}")
-                        return False
+                result = _json_loads(response.content)
+                # Stop at the first error in the results, if any
+                error = next((item['error'] for item in result if 'error' in item), None)
+                if error is not None:
+                    logger.error("Hue API error: %s", error['description'])
+                    return False
                 
                 return True
             
-            logger.error(f"Failed to set light state: {response.status_code}")
+            logger.error("Failed %s: %s", action, response.status_code)
             return False
             
         except Exception as e:
-            self.handle_error("setting light state", e)
+            self.handle_error(action, e)
             return False
     
     def normalize_state(self, state):
@@ -313,8 +620,7 @@ class HueProtocol(ProtocolBase):
         
         # Convert brightness (0-254 to 0-100%)
         if 'bri' in state:
-            bri = state['bri']
-            normalized['brightness'] = int((bri / BRIGHTNESS_RANGE[1]) * 100)
+            normalized['brightness'] = int(state['bri'] * _BRI_TO_PCT)
         
         # Convert color temperature (mirek to kelvin)
         if 'ct' in state:
@@ -332,10 +638,8 @@ class HueProtocol(ProtocolBase):
         
         # Convert hue and saturation
         if 'hue' in state and 'sat' in state:
-            hue = state['hue']
-            sat = state['sat']
-            normalized['hue'] = int((hue / HUE_RANGE[1]) * 360)
-            normalized['saturation'] = int((sat / SATURATION_RANGE[1]) * 100)
+            normalized['hue'] = int(state['hue'] * _HUE_TO_DEG)
+            normalized['saturation'] = int(state['sat'] * _SAT_TO_PCT)
         
         return normalized
     
@@ -343,41 +647,68 @@ class HueProtocol(ProtocolBase):
         """
         Convert generic state values to Hue API format
         
+        Conversions are memoized, so repeated commands such as a stream of
+        identical colors skip the xy chromaticity math.
+        
         Args:
             state: Generic state dictionary
             
         Returns:
             dict: Hue API state dictionary
         """
-        hue_state = {}
+        state_items = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in state.items()
+        ))
         
-        # Convert on/off state
-        if 'on' in state:
-            hue_state['on'] = bool(state['on'])
-        
-        # Convert brightness (0-100% to 0-254)
-        if ATTR_BRIGHTNESS in state:
-            bri = state[ATTR_BRIGHTNESS]
-            hue_state['bri'] = int((bri / 100) * BRIGHTNESS_RANGE[1])
-        
-        # Convert color temperature (kelvin to mirek)
-        if ATTR_COLOR_TEMP in state:
-            kelvin = state[ATTR_COLOR_TEMP]
-            if kelvin > 0:
-                hue_state['ct'] = int(1000000 / kelvin)
-        
-        # Convert RGB color to xy
-        if ATTR_RGB_COLOR in state:
-            rgb = state[ATTR_RGB_COLOR]
-            if len(rgb) == 3:
-                xy = rgb_to_xy(rgb[0], rgb[1], rgb[2])
-                hue_state['xy'] = xy
+        try:
+            hue_state = _convert_to_hue_state_cached(state_items)
+        except TypeError:
+            # Unhashable values cannot be cached; convert them directly
+            hue_state = _convert_to_hue_state_cached.__wrapped__(state_items)
         
-        # Convert hue and saturation
-        if ATTR_HUE in state and ATTR_SATURATION in state:
-            hue = state[ATTR_HUE]
-            sat = state[ATTR_SATURATION]
-            hue_state['hue'] = int((hue / 360) * HUE_RANGE[1])
-            hue_state['sat'] = int((sat / 100) * SATURATION_RANGE[1])
+        # Callers get their own copy of the shared cached result
+        return dict(hue_state)
+
+
+@lru_cache(maxsize=256)
+def _convert_to_hue_state_cached(state_items):
+    """
+    Convert frozen generic state values to Hue API format
+    
+    Args:
+        state_items: Sorted tuple of (attribute, value) pairs
         
-        return hue_state
+    Returns:
+        dict: Hue API state dictionary
+    """
+    state = dict(state_items)
+    hue_state = {}
+    
+    # Convert on/off state
+    if 'on' in state:
+        hue_state['on'] = bool(state['on'])
+    
+    # Convert brightness (0-100% to 0-254)
+    if ATTR_BRIGHTNESS in state:
+        hue_state['bri'] = int(state[ATTR_BRIGHTNESS] * _PCT_TO_BRI)
+    
+    # Convert color temperature (kelvin to mirek)
+    if ATTR_COLOR_TEMP in state:
+        kelvin = state[ATTR_COLOR_TEMP]
+        if kelvin > 0:
+            hue_state['ct'] = int(1000000 / kelvin)
+    
+    # Convert RGB color to xy
+    if ATTR_RGB_COLOR in state:
+        rgb = state[ATTR_RGB_COLOR]
+        if len(rgb) == 3:
+            xy = rgb_to_xy(rgb[0], rgb[1], rgb[2])
+            hue_state['xy'] = xy
+    
+    # Convert hue and saturation
+    if ATTR_HUE in state and ATTR_SATURATION in state:
+        hue_state['hue'] = int(state[ATTR_HUE] * _DEG_TO_HUE)
+        hue_state['sat'] = int(state[ATTR_SATURATION] * _PCT_TO_SAT)
+    
+    return hue_state
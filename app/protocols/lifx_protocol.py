@@ -6,11 +6,10 @@ import logging
 import socket
 import time
 import threading
-from datetime import datetime, timedelta
 
 from ..constants import (
     APP_NAME, ATTR_BRIGHTNESS, ATTR_COLOR_TEMP, ATTR_HUE, 
-    ATTR_SATURATION, ATTR_RGB_COLOR, DISCOVERY_TIMEOUT
+    ATTR_SATURATION, ATTR_RGB_COLOR, DISCOVERY_TIMEOUT, LIFX_DISCOVERY_CACHE_TTL
 )
 from .protocol_base import ProtocolBase
 from .utils import rgb_to_hsv, hsv_to_rgb
@@ -18,6 +17,35 @@ from .utils import rgb_to_hsv, hsv_to_rgb
 
 logger = logging.getLogger(APP_NAME)
 
+# Integer-valued attributes that normalize_state passes through unchanged
+_INT_KEYS = frozenset((ATTR_BRIGHTNESS, ATTR_COLOR_TEMP, ATTR_HUE, ATTR_SATURATION))
+
+
+def _is_normalized(state):
+    """
+    Check whether normalize_state would return the state unchanged
+    
+    That is the case when every value already has its normalized type and
+    no RGB or HSV color has to be derived from the other.
+    
+    Args:
+        state: State dictionary
+        
+    Returns:
+        bool: True if the state is already in normalized form
+    """
+    if ATTR_RGB_COLOR in state or (ATTR_HUE in state and ATTR_SATURATION in state):
+        return False
+    
+    for key, value in state.items():
+        if key == 'on':
+            if type(value) is not bool:
+                return False
+        elif key not in _INT_KEYS or type(value) is not int:
+            return False
+    
+    return True
+
 
 class LifxProtocol(ProtocolBase):
     """
@@ -31,7 +59,7 @@ class LifxProtocol(ProtocolBase):
     def __init__(self):
         """Initialize LIFX protocol handler"""
         self.devices = {}  # MAC -> device info
-        self.last_discovery = None
+        self._last_discovery_ts = 0.0  # Monotonic time of the last discovery
     
     def discover_lights(self, timeout=DISCOVERY_TIMEOUT):
         """
@@ -44,7 +72,8 @@ class LifxProtocol(ProtocolBase):
             list: List of discovered light dictionaries
         """
         # Check if we've done a discovery recently
-        if self.last_discovery and (datetime.now() - self.last_discovery) < timedelta(minutes=5):
+        if (self._last_discovery_ts
+                and time.monotonic() - self._last_discovery_ts < LIFX_DISCOVERY_CACHE_TTL):
             # Return cached devices if discovery was done in the last 5 minutes
             logger.info(f"Using cached LIFX devices from recent discovery ({len(self.devices)})")
             return list(self.devices.values())
@@ -63,13 +92,12 @@ class LifxProtocol(ProtocolBase):
         # except Exception as e:
         #     self.handle_error("LIFX discovery", e)
         
-        # For this example, we'll simulate finding devices
+        # For this example, we'll simulate finding devices. A real UDP
+        # discovery should return as soon as responses stop arriving rather
+        # than waiting out a fixed delay, so none is simulated here.
         discovered = []
         
         try:
-            # Simulate discovery delay
-            time.sleep(1)
-            
             # Simulate some discovered lights
             simulated_lights = [
                 {
@@ -113,7 +141,7 @@ class LifxProtocol(ProtocolBase):
                 self.devices[light['mac']] = light
                 discovered.append(light)
             
-            self.last_discovery = datetime.now()
+            self._last_discovery_ts = time.monotonic()
             logger.info(f"Discovered {len(discovered)} LIFX light(s)")
             
         except Exception as e:
@@ -214,6 +242,21 @@ class LifxProtocol(ProtocolBase):
             self.handle_error("getting LIFX light state", e)
             return {}
     
+    def get_light_states(self, lights):
+        """
+        Get the current state of several LIFX lights at once
+        
+        Args:
+            lights: List of light information dictionaries
+            
+        Returns:
+            list: Light state dictionaries, in the same order as lights
+        """
+        # In a real implementation, we would send GetColor messages to every light
+        # without blocking and then collect the replies in a single select() loop.
+        # Until then, query the lights concurrently on the shared protocol pool.
+        return self.submit_many(self.get_light_state, ((light_info,) for light_info in lights))
+    
     def set_light_state(self, light_info, state):
         """
         Set the state of a LIFX light
@@ -265,6 +308,10 @@ class LifxProtocol(ProtocolBase):
         Returns:
             dict: Normalized state dictionary
         """
+        # Simple commands such as on/off or brightness need no conversion
+        if _is_normalized(state):
+            return dict(state)
+        
         normalized = {}
         
         # Most values in the LIFX API can be used directly
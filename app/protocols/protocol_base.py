@@ -4,8 +4,9 @@ Base protocol class for smart light communication
 
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
-from ..constants import APP_NAME
+from ..constants import APP_NAME, PROTOCOL_MAX_WORKERS
 
 
 logger = logging.getLogger(APP_NAME)
@@ -17,6 +18,12 @@ class ProtocolBase(ABC):
     Defines the interface that all protocol implementations must follow
     """
     
+    # Thread pool shared by all protocols for concurrent device I/O
+    _executor = ThreadPoolExecutor(
+        max_workers=PROTOCOL_MAX_WORKERS,
+        thread_name_prefix="proto"
+    )
+    
     @abstractmethod
     def discover_devices(self, timeout=5):
         """
@@ -95,6 +102,39 @@ class ProtocolBase(ABC):
         """
         pass
     
+    def submit(self, func, *args):
+        """
+        Run a function on the shared protocol pool
+        
+        The same rule as for submit_many applies: do not wait on the
+        returned future from a task already running in the pool.
+        
+        Args:
+            func: Function to call
+            *args: Arguments for the call
+            
+        Returns:
+            Future: Future for the return value of the call
+        """
+        return self._executor.submit(func, *args)
+    
+    def submit_many(self, func, args_iter):
+        """
+        Run a function concurrently for several argument tuples
+        
+        Only call this from outside the shared pool: a task that waits on
+        further tasks in the same pool can deadlock it.
+        
+        Args:
+            func: Function to call
+            args_iter: Iterable of argument tuples, one per call
+            
+        Returns:
+            list: Return values of the calls, in the same order as args_iter
+        """
+        futures = [self._executor.submit(func, *args) for args in args_iter]
+        return [future.result() for future in futures]
+    
     def handle_error(self, action, error):
         """
         Handle and log protocol errors
@@ -102,7 +142,10 @@ class ProtocolBase(ABC):
         Args:
             action: Description of the action that failed
             error: Exception object or error message
+            
+        Returns:
+            str: The error message that was logged
         """
         error_msg = str(error)
-        logger.error(f"Protocol error during {action}: {error_msg}")
+        logger.error("Protocol error during %s: %s", action, error_msg)
         return error_msg
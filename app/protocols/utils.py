@@ -3,7 +3,39 @@ Utility functions for light protocol implementations
 """
 
 import math
-import colorsys
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # Batch conversions fall back to the scalar functions
+    np = None
+
+try:
+    import numba
+except ImportError:  # Batch conversions use plain NumPy expressions
+    numba = None
+
+
+# Linear RGB to CIE XYZ matrix (wide gamut D65) used for Hue xy conversion
+_RGB_TO_XYZ = (
+    (0.649926, 0.103455, 0.197109),
+    (0.234327, 0.743075, 0.022598),
+    (0.000000, 0.053077, 1.035763),
+)
+
+# Red/blue ratio thresholds (ascending) and the kelvin estimate for each band
+# they delimit, from very cool (ratio <= 0.4) to very warm (ratio > 2.5)
+_KELVIN_THRESHOLDS = (0.4, 0.5, 0.6, 0.8, 1.0, 1.2, 1.5, 2.0, 2.5)
+_KELVIN_BANDS = (6500, 6000, 5500, 5000, 4500, 4000, 3500, 3000, 2500, 2000)
+
+# CIE XYZ to linear RGB matrix (wide gamut D65) used for Hue xy conversion
+_XYZ_TO_RGB = (
+    (1.656492, -0.354851, -0.255038),
+    (-0.707196, 1.655397, 0.036152),
+    (0.051713, -0.121364, 1.011530),
+)
 
 
 def rgb_to_xy(red, green, blue):
@@ -18,20 +50,23 @@ def rgb_to_xy(red, green, blue):
     Returns:
         tuple: (x, y) coordinates in CIE color space
     """
-    # Normalize RGB values to 0-1
-    r = red / 255.0
-    g = green / 255.0
-    b = blue / 255.0
+    # Look up the gamma-corrected values of 0-255 integer components
+    lut = _GAMMA_LUT
+    r = lut.get(red)
+    g = lut.get(green)
+    b = lut.get(blue)
     
-    # Apply gamma correction
-    r = _gamma_correct(r)
-    g = _gamma_correct(g)
-    b = _gamma_correct(b)
+    if r is None or g is None or b is None:
+        # Normalize RGB values to 0-1 and apply gamma correction
+        r = _gamma_correct(red / 255.0)
+        g = _gamma_correct(green / 255.0)
+        b = _gamma_correct(blue / 255.0)
     
     # Convert to XYZ color space
-    X = r * 0.649926 + g * 0.103455 + b * 0.197109
-    Y = r * 0.234327 + g * 0.743075 + b * 0.022598
-    Z = r * 0.000000 + g * 0.053077 + b * 1.035763
+    (xr, xg, xb), (yr, yg, yb), (zr, zg, zb) = _RGB_TO_XYZ
+    X = r * xr + g * xg + b * xb
+    Y = r * yr + g * yg + b * yb
+    Z = r * zr + g * zg + b * zb
     
     # Calculate xy values
     sum_XYZ = X + Y + Z
@@ -44,6 +79,48 @@ def rgb_to_xy(red, green, blue):
     return (x, y)
 
 
+def rgb_to_xy_batch(colors):
+    """
+    Convert many RGB colors to CIE xy chromaticity at once
+    
+    Uses a single vectorized NumPy pass when NumPy is installed, and the
+    scalar conversion for each color otherwise.
+    
+    Args:
+        colors: Sequence of (red, green, blue) tuples (0-255)
+        
+    Returns:
+        list: (x, y) tuples, in the same order as colors
+    """
+    if np is None or not len(colors):
+        return [rgb_to_xy(red, green, blue) for red, green, blue in colors]
+    
+    # Normalize and gamma-correct all channels together, with a single
+    # table lookup when every component is a 0-255 integer
+    kernels = _numba_kernels()
+    rgb = np.asarray(colors)
+    if rgb.dtype.kind in 'iu' and rgb.min() >= 0 and rgb.max() <= 255:
+        if kernels is not None:
+            xy = kernels.rgb_to_xy(rgb.astype(np.uint8), _XY_OUT_TEMPLATE)
+            return list(map(tuple, xy.tolist()))
+        rgb = _GAMMA_LUT_ARRAY[rgb]
+    elif kernels is not None:
+        rgb = kernels.gamma_correct(rgb / 255.0)
+    else:
+        rgb = rgb / 255.0
+        rgb = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+    
+    # Convert to XYZ and then to xy, mapping black to (0, 0)
+    xyz = rgb @ np.array(_RGB_TO_XYZ).T
+    total = xyz.sum(axis=1)
+    black = total == 0
+    total[black] = 1.0
+    x = np.where(black, 0.0, xyz[:, 0] / total)
+    y = np.where(black, 0.0, xyz[:, 1] / total)
+    
+    return list(zip(x.tolist(), y.tolist()))
+
+
 def xy_to_rgb(x, y, brightness=1.0):
     """
     Convert CIE xy chromaticity to RGB color
@@ -65,9 +142,10 @@ def xy_to_rgb(x, y, brightness=1.0):
     Z = (Y / y) * (1 - x - y)
     
     # Convert to RGB
-    r = X * 1.656492 - Y * 0.354851 - Z * 0.255038
-    g = -X * 0.707196 + Y * 1.655397 + Z * 0.036152
-    b = X * 0.051713 - Y * 0.121364 + Z * 1.011530
+    (rx, ry, rz), (gx, gy, gz), (bx, by, bz) = _XYZ_TO_RGB
+    r = X * rx + Y * ry + Z * rz
+    g = X * gx + Y * gy + Z * gz
+    b = X * bx + Y * by + Z * bz
     
     # Apply gamma correction and clamp values
     r = _reverse_gamma(r)
@@ -75,11 +153,52 @@ def xy_to_rgb(x, y, brightness=1.0):
     b = _reverse_gamma(b)
     
     # Convert to 0-255 range and clamp
-    r = max(0, min(255, int(r * 255)))
-    g = max(0, min(255, int(g * 255)))
-    b = max(0, min(255, int(b * 255)))
+    return (_clamp_u8(r), _clamp_u8(g), _clamp_u8(b))
+
+
+def xy_to_rgb_batch(points, brightness=1.0):
+    """
+    Convert many CIE xy chromaticities to RGB colors at once
+    
+    Uses a single vectorized NumPy pass when NumPy is installed, and the
+    scalar conversion for each point otherwise.
+    
+    Args:
+        points: Sequence of (x, y) tuples in CIE color space
+        brightness: Brightness value (0-1) applied to every point
+        
+    Returns:
+        list: (red, green, blue) tuples (0-255), in the same order as points
+    """
+    if np is None or not len(points):
+        return [xy_to_rgb(x, y, brightness) for x, y in points]
+    
+    xy = np.asarray(points, dtype=np.float64)
+    x = xy[:, 0]
+    y = xy[:, 1]
     
-    return (r, g, b)
+    # Calculate XYZ values, mapping y == 0 to black below
+    black = y == 0
+    scale = brightness / np.where(black, 1.0, y)
+    xyz = np.column_stack((scale * x, np.full_like(x, brightness), scale * (1 - x - y)))
+    
+    # Convert to RGB and reverse the gamma correction
+    rgb = xyz @ np.array(_XYZ_TO_RGB).T
+    kernels = _numba_kernels()
+    if kernels is not None:
+        rgb = kernels.reverse_gamma(rgb)
+    else:
+        rgb = np.where(
+            rgb <= 0.0031308,
+            rgb * 12.92,
+            1.055 * np.maximum(rgb, 0.0031308) ** (1 / 2.4) - 0.055
+        )
+    
+    # Convert to 0-255 range, truncating like int(), and clamp
+    rgb = np.clip(np.trunc(rgb * 255), 0, 255).astype(int)
+    rgb[black] = 0
+    
+    return [tuple(color) for color in rgb.tolist()]
 
 
 def rgb_to_hsv(red, green, blue):
@@ -99,13 +218,55 @@ def rgb_to_hsv(red, green, blue):
     g = green / 255.0
     b = blue / 255.0
     
-    # Convert to HSV
-    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    # Value and chroma from the largest and smallest components
+    cmax = max(r, g, b)
+    delta = cmax - min(r, g, b)
+    if delta == 0:
+        return (0.0, 0.0, cmax)
+    
+    # Hue sector depends on which component is largest
+    if r == cmax:
+        h = ((g - b) / delta) % 6
+    elif g == cmax:
+        h = (b - r) / delta + 2
+    else:
+        h = (r - g) / delta + 4
+    
+    return (h * 60, delta / cmax, cmax)
+
+
+def rgb_to_hsv_batch(colors):
+    """
+    Convert many RGB colors to HSV color space at once
+    
+    Uses a single vectorized NumPy pass when NumPy is installed, and the
+    scalar conversion for each color otherwise.
     
-    # Convert hue to degrees
-    h = h * 360
+    Args:
+        colors: Sequence of (red, green, blue) tuples (0-255)
+        
+    Returns:
+        list: (hue, saturation, value) tuples, in the same order as colors
+    """
+    if np is None or not len(colors):
+        return [rgb_to_hsv(red, green, blue) for red, green, blue in colors]
+    
+    rgb = np.asarray(colors, dtype=np.float64) / 255.0
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    
+    cmax = rgb.max(axis=1)
+    delta = cmax - rgb.min(axis=1)
+    gray = delta == 0
+    safe_delta = np.where(gray, 1.0, delta)
     
-    return (h, s, v)
+    h = np.select(
+        [gray, r == cmax, g == cmax],
+        [0.0, ((g - b) / safe_delta) % 6, (b - r) / safe_delta + 2],
+        default=(r - g) / safe_delta + 4
+    )
+    s = np.where(gray, 0.0, delta / np.where(cmax == 0, 1.0, cmax))
+    
+    return list(zip((h * 60).tolist(), s.tolist(), cmax.tolist()))
 
 
 def hsv_to_rgb(hue, saturation, value):
@@ -120,18 +281,23 @@ def hsv_to_rgb(hue, saturation, value):
     Returns:
         tuple: (red, green, blue) values (0-255)
     """
-    # Normalize hue to 0-1
-    h = hue / 360.0
-    
-    # Convert to RGB
-    r, g, b = colorsys.hsv_to_rgb(h, saturation, value)
-    
-    # Convert to 0-255 range
-    r = max(0, min(255, int(r * 255)))
-    g = max(0, min(255, int(g * 255)))
-    b = max(0, min(255, int(b * 255)))
+    # Convert to RGB using the hue sector and the position within it
+    if saturation == 0:
+        r = g = b = value
+    else:
+        h = (hue / 360.0) * 6.0
+        sector = int(h)
+        f = h - sector
+        p = value * (1.0 - saturation)
+        q = value * (1.0 - saturation * f)
+        t = value * (1.0 - saturation * (1.0 - f))
+        r, g, b = (
+            (value, t, p), (q, value, p), (p, value, t),
+            (p, q, value), (t, p, value), (value, p, q)
+        )[sector % 6]
     
-    return (r, g, b)
+    # Convert to 0-255 range and clamp
+    return (_clamp_u8(r), _clamp_u8(g), _clamp_u8(b))
 
 
 def _gamma_correct(value):
@@ -150,6 +316,81 @@ def _reverse_gamma(value):
         return 1.055 * (value ** (1 / 2.4)) - 0.055
 
 
+def _clamp_u8(value):
+    """Scale a 0-1 color value to an integer clamped to 0-255"""
+    value = int(value * 255)
+    return 0 if value < 0 else (255 if value > 255 else value)
+
+
+# Gamma-corrected values of the 0-255 integer color components
+_GAMMA_LUT = {i: _gamma_correct(i / 255.0) for i in range(256)}
+_GAMMA_LUT_ARRAY = (
+    np.array([_GAMMA_LUT[i] for i in range(256)]) if np is not None else None
+)
+
+def _rgb_to_xy_kernel(rgb, template, out):
+    """Convert one 0-255 (red, green, blue) row to an (x, y) row"""
+    r = _GAMMA_LUT_ARRAY[rgb[0]]
+    g = _GAMMA_LUT_ARRAY[rgb[1]]
+    b = _GAMMA_LUT_ARRAY[rgb[2]]
+    
+    (xr, xg, xb), (yr, yg, yb), (zr, zg, zb) = _RGB_TO_XYZ
+    X = r * xr + g * xg + b * xb
+    Y = r * yr + g * yg + b * yb
+    Z = r * zr + g * zg + b * zb
+    
+    # Black has X == Y == 0, so dividing by 1 maps it to (0, 0) without
+    # a branch the compiler could evaluate speculatively as 0 / 0
+    sum_XYZ = X + Y + Z
+    if sum_XYZ == 0:
+        sum_XYZ = 1.0
+    out[0] = X / sum_XYZ
+    out[1] = Y / sum_XYZ
+
+
+# Output row of the compiled RGB to xy kernel. It only carries the row length,
+# which guvectorize cannot infer from the input layout.
+_XY_OUT_TEMPLATE = np.empty(2) if np is not None else None
+
+
+@dataclass(slots=True, frozen=True)
+class _NumbaKernels:
+    """
+    Compiled kernels for the batch conversions
+    
+    The scalar conversions keep the plain functions: calling a compiled
+    function from the interpreter for a single value costs more than the
+    math itself.
+    """
+    
+    gamma_correct: object  # Element-wise _gamma_correct
+    reverse_gamma: object  # Element-wise _reverse_gamma
+    rgb_to_xy: object      # Row-wise _rgb_to_xy_kernel on 0-255 uint8 colors
+
+
+@lru_cache(maxsize=1)
+def _numba_kernels():
+    """
+    Compile the Numba kernels on the first batch conversion
+    
+    Compiling takes seconds, so it is deferred from import time to the first
+    call; cache=True lets later runs load the machine code from disk instead.
+    
+    Returns:
+        _NumbaKernels: Compiled kernels, or None if Numba or NumPy is missing
+    """
+    if numba is None or np is None:
+        return None
+    
+    return _NumbaKernels(
+        gamma_correct=numba.vectorize(['float64(float64)'], cache=True)(_gamma_correct),
+        reverse_gamma=numba.vectorize(['float64(float64)'], cache=True)(_reverse_gamma),
+        rgb_to_xy=numba.guvectorize(
+            ['void(uint8[:], float64[:], float64[:])'], '(n),(m)->(m)', cache=True
+        )(_rgb_to_xy_kernel)
+    )
+
+
 def kelvin_to_rgb(kelvin):
     """
     Convert color temperature in Kelvin to RGB
@@ -161,6 +402,15 @@ def kelvin_to_rgb(kelvin):
     Returns:
         tuple: (red, green, blue) values (0-255)
     """
+    # Multiples of 100 K, as produced by the UI, come from the precomputed table
+    rgb = _KELVIN_LUT.get(kelvin)
+    if rgb is None:
+        rgb = _kelvin_to_rgb(kelvin)
+    return rgb
+
+
+def _kelvin_to_rgb(kelvin):
+    """Compute the RGB approximation of a color temperature in Kelvin"""
     # Clamp kelvin to valid range
     temperature = max(1000, min(40000, kelvin)) / 100
     
@@ -194,6 +444,10 @@ def kelvin_to_rgb(kelvin):
     return (int(red), int(green), int(blue))
 
 
+# RGB values for every multiple of 100 K in the valid range
+_KELVIN_LUT = {kelvin: _kelvin_to_rgb(kelvin) for kelvin in range(1000, 40001, 100)}
+
+
 def rgb_to_kelvin(red, green, blue):
     """
     Estimate color temperature in Kelvin from RGB
@@ -219,26 +473,6 @@ def rgb_to_kelvin(red, green, blue):
     if b == 0:
         return 2000  # Very warm
     
-    # Calculate kelvin based on RGB ratio
-    rgb_ratio = r / b
-    
-    if rgb_ratio > 2.5:
-        return 2000  # Very warm
-    elif rgb_ratio > 2.0:
-        return 2500
-    elif rgb_ratio > 1.5:
-        return 3000
-    elif rgb_ratio > 1.2:
-        return 3500
-    elif rgb_ratio > 1.0:
-        return 4000
-    elif rgb_ratio > 0.8:
-        return 4500
-    elif rgb_ratio > 0.6:
-        return 5000
-    elif rgb_ratio > 0.5:
-        return 5500
-    elif rgb_ratio > 0.4:
-        return 6000
-    else:
-        return 6500  # Very cool
+    # Look up kelvin for the RGB ratio; a ratio equal to a threshold belongs
+    # to the cooler band, as each band starts just above its threshold
+    return _KELVIN_BANDS[bisect_left(_KELVIN_THRESHOLDS, r / b)]
@@ -0,0 +1,73 @@
+"""
+Readers-writer lock used to protect shared device state
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Lock allowing many concurrent readers or a single writer
+    
+    Waiting writers are preferred over new readers so that a steady stream
+    of reads cannot starve updates. The lock is not reentrant: a thread must
+    not acquire it again, for reading or writing, while it already holds it.
+    """
+    
+    def __init__(self):
+        """Initialize an unlocked readers-writer lock"""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writing = False
+    
+    def acquire_read(self):
+        """Acquire the lock for reading"""
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+    
+    def release_read(self):
+        """Release a read lock"""
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        """Acquire the lock for writing"""
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writing or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            
+            self._writing = True
+    
+    def release_write(self):
+        """Release a write lock"""
+        with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+    
+    @contextmanager
+    def read(self):
+        """Context manager holding the lock for reading"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        """Context manager holding the lock for writing"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
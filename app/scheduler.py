@@ -4,10 +4,11 @@ Scheduler for automating light control
 
 import logging
 import threading
-import time
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtCore import QObject, Signal
 
 from .constants import APP_NAME
 
@@ -15,6 +16,29 @@ from .constants import APP_NAME
 logger = logging.getLogger(APP_NAME)
 
 
+@dataclass(slots=True)
+class _ParsedSchedule:
+    """
+    Schedule fields parsed once, so the scheduler does no string parsing per tick
+    
+    Dates and times are kept as tuples that compare directly against the
+    (year, month, day, hour, minute, weekday) tuple built once per tick.
+    """
+    
+    time_hm: tuple = None    # (hour, minute), or None if missing or invalid
+    last_run: tuple = None   # (year, month, day, hour, minute) of the last run
+    day_mask: int = None     # Bit n set if the schedule runs on weekday n, None for any day
+    date_ymd: tuple = None   # (year, month, day), () if invalid, None for any date
+
+
+# Day masks for the named day sets (bit 0 is Monday)
+_DAY_MASKS = {
+    'weekdays': 0b0011111,  # Monday to Friday
+    'weekend': 0b1100000,   # Saturday and Sunday
+    'all': 0b1111111
+}
+
+
 class SchedulerService(QObject):
     """
     Service for scheduling automatic light control actions
@@ -30,9 +54,19 @@ class SchedulerService(QObject):
         self.light_manager = light_manager
         self.config_manager = config_manager
         self.schedules = {}  # Schedule ID -> schedule info
+        self._parsed = {}    # Schedule ID -> _ParsedSchedule
+        self._by_minute = defaultdict(set)  # (hour, minute) -> schedule IDs
+        self._state_handlers = {             # Target type -> set_state handler
+            'light': self._set_light_state,
+            'group': self._set_group_state,
+            'all': self._set_all_state
+        }
         self.stop_event = threading.Event()
         self.scheduler_thread = None
-        self.check_timer = QTimer(self)
+        
+        # Schedules whose last run time has not been handed to the config yet
+        self._dirty_last_run = set()
+        self._last_run_lock = threading.Lock()
         
         # Load saved schedules
         self._load_schedules()
@@ -47,8 +81,73 @@ class SchedulerService(QObject):
         for schedule in schedule_list:
             if 'id' in schedule:
                 self.schedules[schedule['id']] = schedule
+                self._parse_schedule(schedule)
+        
+        logger.info("Loaded %d schedules", len(self.schedules))
+    
+    def _parse_schedule(self, schedule):
+        """
+        Parse and cache the time fields of a schedule and index it by minute
+        
+        Args:
+            schedule: Schedule information dictionary
+            
+        Returns:
+            _ParsedSchedule: Parsed fields of the schedule
+        """
+        schedule_id = schedule.get('id')
+        self._unindex_schedule(schedule_id)
+        parsed = _ParsedSchedule()
+        
+        if 'time' in schedule:
+            try:
+                hour, minute = map(int, schedule['time'].split(':'))
+                parsed.time_hm = (hour, minute)
+            except (AttributeError, ValueError):
+                logger.warning(f"Invalid time for schedule {schedule.get('id')}: {schedule['time']}")
+        
+        if 'days' in schedule:
+            parsed.day_mask = self._day_mask(schedule['days'])
         
-        logger.info(f"Loaded {len(self.schedules)} schedules")
+        date = schedule.get('date')
+        if date:
+            try:
+                date = datetime.fromisoformat(date)
+                parsed.date_ymd = (date.year, date.month, date.day)
+            except (TypeError, ValueError):
+                # An unreadable date never matches
+                parsed.date_ymd = ()
+                logger.warning(f"Invalid date for schedule {schedule.get('id')}: {date}")
+        
+        last_run = schedule.get('last_run')
+        if last_run:
+            try:
+                parsed.last_run = self._minute_tuple(datetime.fromisoformat(last_run))
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid last run for schedule {schedule.get('id')}: {last_run}")
+        
+        self._parsed[schedule_id] = parsed
+        if parsed.time_hm is not None:
+            self._by_minute[parsed.time_hm].add(schedule_id)
+        
+        return parsed
+    
+    def _unindex_schedule(self, schedule_id):
+        """Drop the parsed fields and minute index entry of a schedule"""
+        parsed = self._parsed.pop(schedule_id, None)
+        if parsed is not None and parsed.time_hm is not None:
+            bucket = self._by_minute.get(parsed.time_hm)
+            if bucket is not None:
+                bucket.discard(schedule_id)
+                if not bucket:
+                    del self._by_minute[parsed.time_hm]
+    
+    def _get_parsed(self, schedule):
+        """Get the cached parsed fields of a schedule, parsing them if needed"""
+        parsed = self._parsed.get(schedule.get('id'))
+        if parsed is None:
+            parsed = self._parse_schedule(schedule)
+        return parsed
     
     def _start_scheduler(self):
         """Start the scheduler thread"""
@@ -59,19 +158,24 @@ class SchedulerService(QObject):
         )
         self.scheduler_thread.start()
         
-        # Set up timer to check schedules every minute in the UI thread
-        self.check_timer.timeout.connect(self._check_schedules)
-        self.check_timer.start(60000)  # 1 minute
-        
         logger.info("Scheduler started")
     
-    def stop(self):
-        """Stop the scheduler thread"""
+    def stop(self, wait=True):
+        """
+        Stop the scheduler thread
+        
+        Args:
+            wait: Block until the thread has exited; when False the thread is
+                only signalled and exits on its own shortly afterwards
+        """
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             self.stop_event.set()
-            self.scheduler_thread.join(timeout=1.0)
-            self.check_timer.stop()
+            if wait:
+                self.scheduler_thread.join(timeout=1.0)
             logger.info("Scheduler stopped")
+        
+        # Hand over last run times before the configuration is saved
+        self._flush_last_runs()
     
     def _scheduler_loop(self):
         """
@@ -81,26 +185,31 @@ class SchedulerService(QObject):
         while not self.stop_event.is_set():
             try:
                 self._process_schedules()
+                self._flush_last_runs()
+                
+                # Let the UI show schedules that are about to trigger; the
+                # signal is queued to the UI thread
+                if self._has_upcoming_schedules():
+                    self.schedule_updated.emit()
             except Exception as e:
                 logger.error(f"Error in scheduler: {str(e)}")
             
-            # Sleep until the next minute
+            # Sleep until the next minute, waking early if stopped
             now = datetime.now()
             next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
             sleep_seconds = (next_minute - now).total_seconds()
             
-            # Sleep in small increments to check for stop event
-            for _ in range(int(sleep_seconds / 0.2)):
-                if self.stop_event.is_set():
-                    break
-                time.sleep(0.2)
+            if self.stop_event.wait(timeout=sleep_seconds):
+                break
     
     def _process_schedules(self):
-        """Process all schedules and trigger those that should run now"""
+        """Process the schedules set for this minute and trigger those that should run now"""
         now = datetime.now()
+        now_tuple = (now.year, now.month, now.day, now.hour, now.minute, now.weekday())
         
-        for schedule_id, schedule in self.schedules.items():
-            if self._should_trigger_schedule(schedule, now):
+        for schedule_id in tuple(self._by_minute.get((now.hour, now.minute), ())):
+            schedule = self.schedules.get(schedule_id)
+            if schedule is not None and self._should_trigger_schedule(schedule, now_tuple):
                 self._trigger_schedule(schedule_id)
     
     def _should_trigger_schedule(self, schedule, now):
@@ -109,7 +218,7 @@ class SchedulerService(QObject):
         
         Args:
             schedule: Schedule information dictionary
-            now: Current datetime
+            now: Current (year, month, day, hour, minute, weekday) tuple
             
         Returns:
             bool: True if schedule should trigger, False otherwise
@@ -118,66 +227,49 @@ class SchedulerService(QObject):
         if not schedule.get('enabled', True):
             return False
         
+        parsed = self._get_parsed(schedule)
+        
         # Check if time matches
-        if not self._time_matches(schedule, now):
+        if parsed.time_hm != now[3:5]:
             return False
         
         # Check if day matches (if days are specified)
-        if 'days' in schedule and not self._day_matches(schedule, now):
+        if parsed.day_mask is not None and not (parsed.day_mask >> now[5]) & 1:
             return False
         
         # Check if date matches (if specific date is set)
-        if 'date' in schedule and not self._date_matches(schedule, now):
+        if parsed.date_ymd is not None and parsed.date_ymd != now[:3]:
             return False
         
-        # Check last run time to avoid duplicate triggers
-        last_run = schedule.get('last_run')
-        if last_run:
-            last_datetime = datetime.fromisoformat(last_run)
-            if now - last_datetime < timedelta(minutes=1):
-                return False
-        
-        return True
-    
-    def _time_matches(self, schedule, now):
-        """Check if the current time matches schedule time"""
-        if 'time' not in schedule:
+        # Skip schedules that already ran this minute
+        if parsed.last_run == now[:5]:
             return False
         
-        schedule_time = schedule['time']
-        hour, minute = map(int, schedule_time.split(':'))
-        
-        return now.hour == hour and now.minute == minute
+        return True
     
-    def _day_matches(self, schedule, now):
-        """Check if the current day matches schedule days"""
-        days = schedule['days']
-        weekday = now.weekday()  # 0-6 (Monday to Sunday)
+    @staticmethod
+    def _day_mask(days):
+        """
+        Convert a schedule's days to a weekday bit mask
         
-        # Convert to consistent format
+        Args:
+            days: List of weekday numbers (0-6, Monday to Sunday) or a string
+                ('weekdays', 'weekend', 'all')
+            
+        Returns:
+            int: Mask with bit n set if the schedule runs on weekday n
+        """
         if isinstance(days, list):
-            return weekday in days
+            return sum(1 << weekday for weekday in range(7) if weekday in days)
         elif isinstance(days, str):
-            if days == 'weekdays':
-                return 0 <= weekday <= 4  # Monday to Friday
-            elif days == 'weekend':
-                return weekday >= 5  # Saturday or Sunday
-            elif days == 'all':
-                return True
+            return _DAY_MASKS.get(days, 0)
         
-        return False
+        return 0
     
-    def _date_matches(self, schedule, now):
-        """Check if the current date matches a specific date"""
-        if 'date' not in schedule:
-            return True  # No date restriction
-        
-        schedule_date = schedule['date']
-        schedule_datetime = datetime.fromisoformat(schedule_date)
-        
-        return (now.year == schedule_datetime.year and 
-                now.month == schedule_datetime.month and 
-                now.day == schedule_datetime.day)
+    @staticmethod
+    def _minute_tuple(moment):
+        """Get the (year, month, day, hour, minute) tuple of a datetime"""
+        return (moment.year, moment.month, moment.day, moment.hour, moment.minute)
     
     def _trigger_schedule(self, schedule_id):
         """
@@ -191,11 +283,14 @@ class SchedulerService(QObject):
             logger.error(f"Cannot find schedule {schedule_id}")
             return
         
-        logger.info(f"Triggering schedule: {schedule.get('name', schedule_id)}")
+        logger.info("Triggering schedule: %s", schedule.get('name', schedule_id))
         
         # Update last run time
-        schedule['last_run'] = datetime.now().isoformat()
-        self.config_manager.add_schedule(schedule)
+        last_run = datetime.now()
+        schedule['last_run'] = last_run.isoformat()
+        self._get_parsed(schedule).last_run = self._minute_tuple(last_run)
+        with self._last_run_lock:
+            self._dirty_last_run.add(schedule_id)
         
         # Process actions
         actions = schedule.get('actions', [])
@@ -205,6 +300,20 @@ class SchedulerService(QObject):
         # Emit signal
         self.schedule_triggered.emit(schedule_id)
     
+    def _flush_last_runs(self):
+        """Persist the last run times of triggered schedules in one config update"""
+        with self._last_run_lock:
+            if not self._dirty_last_run:
+                return
+            dirty, self._dirty_last_run = self._dirty_last_run, set()
+        
+        last_runs = {
+            schedule_id: self.schedules[schedule_id]['last_run']
+            for schedule_id in dirty if schedule_id in self.schedules
+        }
+        if last_runs:
+            self.config_manager.update_last_runs(last_runs)
+    
     def _execute_action(self, action):
         """
         Execute a single schedule action
@@ -217,51 +326,65 @@ class SchedulerService(QObject):
         target_id = action.get('target_id')
         state = action.get('state', {})
         
-        logger.debug(f"Executing action: {action_type} on {target_type} {target_id}")
+        logger.debug("Executing action: %s on %s %s", action_type, target_type, target_id)
         
-        try:
-            if action_type == 'set_state':
-                if target_type == 'light':
-                    # Action for a single light
-                    protocol, light_id = action.get('target_id').split('/')
-                    self.light_manager.set_light_state(protocol, light_id, state)
-                    
-                elif target_type == 'group':
-                    # Action for a group
-                    self.light_manager.set_group_state(target_id, state)
-                    
-                elif target_type == 'all':
-                    # Action for all lights
-                    on_state = state.get('on')
-                    if on_state is not None:
-                        self.light_manager.set_all_lights(on_state)
+        if action_type != 'set_state':
+            return
+        
+        handler = self._state_handlers.get(target_type)
+        if handler is None:
+            return
         
+        try:
+            handler(target_id, state)
         except Exception as e:
             logger.error(f"Error executing schedule action: {str(e)}")
     
-    def _check_schedules(self):
+    def _set_light_state(self, target_id, state):
+        """Apply a schedule action to a single light ('protocol/light_id')"""
+        protocol, light_id = target_id.split('/')
+        self.light_manager.set_light_state(protocol, light_id, state)
+    
+    def _set_group_state(self, target_id, state):
+        """Apply a schedule action to a group"""
+        self.light_manager.set_group_state(target_id, state)
+    
+    def _set_all_state(self, target_id, state):
+        """Apply a schedule action's on/off state to all lights"""
+        on_state = state.get('on')
+        if on_state is not None:
+            self.light_manager.set_all_lights(on_state)
+    
+    def _has_upcoming_schedules(self):
         """
-        Check for schedule triggers (in UI thread)
-        This is a lightweight version that just updates the UI
+        Check whether any schedule is due to trigger within the next minute
+        
+        Returns:
+            bool: True if a schedule is about to trigger, False otherwise
         """
         now = datetime.now()
         
-        for schedule_id, schedule in self.schedules.items():
-            # Check if schedule is due in the next minute
-            if self._should_trigger_soon(schedule, now):
-                # Update UI to show schedule is about to trigger
-                self.schedule_updated.emit()
+        # Only schedules set for the upcoming minute can be due within a minute
+        upcoming = now.replace(second=0, microsecond=0)
+        if upcoming != now:
+            upcoming += timedelta(minutes=1)
+        
+        return any(
+            self._should_trigger_soon(self.schedules[schedule_id], now)
+            for schedule_id in tuple(self._by_minute.get((upcoming.hour, upcoming.minute), ()))
+            if schedule_id in self.schedules
+        )
     
     def _should_trigger_soon(self, schedule, now):
         """Check if schedule will trigger in the next minute"""
         if not schedule.get('enabled', True):
             return False
         
-        if 'time' not in schedule:
+        time_hm = self._get_parsed(schedule).time_hm
+        if time_hm is None:
             return False
         
-        # Parse schedule time
-        hour, minute = map(int, schedule['time'].split(':'))
+        hour, minute = time_hm
         
         # Check if time is within the next minute
         target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
@@ -328,6 +451,7 @@ class SchedulerService(QObject):
         if self.config_manager.add_schedule(schedule_info):
             # Add to local cache
             self.schedules[schedule_id] = schedule_info
+            self._parse_schedule(schedule_info)
             self.schedule_updated.emit()
             return schedule_id
         
@@ -350,6 +474,7 @@ class SchedulerService(QObject):
         
         # Update schedule fields
         self.schedules[schedule_id].update(kwargs)
+        self._parse_schedule(self.schedules[schedule_id])
         
         # Save to configuration
         if self.config_manager.add_schedule(self.schedules[schedule_id]):
@@ -376,6 +501,7 @@ class SchedulerService(QObject):
         if self.config_manager.remove_schedule(schedule_id):
             # Remove from local cache
             del self.schedules[schedule_id]
+            self._unindex_schedule(schedule_id)
             self.schedule_updated.emit()
             return True
         
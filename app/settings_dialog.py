@@ -16,6 +16,10 @@ from .ui.icons import get_icon
 
 logger = logging.getLogger(APP_NAME)
 
+# Setting values for each combo box index
+NOTIFICATION_LEVELS = ('minimal', 'normal', 'verbose')
+LOG_LEVELS = ('error', 'warning', 'info', 'debug')
+
 
 class SettingsDialog(QDialog):
     """
@@ -165,12 +169,8 @@ class SettingsDialog(QDialog):
         self.dark_mode_check.setChecked(settings.get('dark_mode', False))
         
         notification_level = settings.get('notification_level', 'normal')
-        if notification_level == 'minimal':
-            self.notification_combo.setCurrentIndex(0)
-        elif notification_level == 'normal':
-            self.notification_combo.setCurrentIndex(1)
-        elif notification_level == 'verbose':
-            self.notification_combo.setCurrentIndex(2)
+        if notification_level in NOTIFICATION_LEVELS:
+            self.notification_combo.setCurrentIndex(NOTIFICATION_LEVELS.index(notification_level))
         
         self.check_updates_check.setChecked(settings.get('startup_check_updates', True))
         
@@ -180,14 +180,8 @@ class SettingsDialog(QDialog):
         
         # Logging settings
         log_level = settings.get('log_level', 'info')
-        if log_level == 'error':
-            self.log_level_combo.setCurrentIndex(0)
-        elif log_level == 'warning':
-            self.log_level_combo.setCurrentIndex(1)
-        elif log_level == 'info':
-            self.log_level_combo.setCurrentIndex(2)
-        elif log_level == 'debug':
-            self.log_level_combo.setCurrentIndex(3)
+        if log_level in LOG_LEVELS:
+            self.log_level_combo.setCurrentIndex(LOG_LEVELS.index(log_level))
     
     def accept(self):
         """Save settings and close dialog"""
@@ -196,37 +190,30 @@ class SettingsDialog(QDialog):
     
     def save_settings(self):
         """Save settings from UI to configuration"""
-        # Discovery settings
-        self.config_manager.set_setting('auto_discover', self.auto_discover_check.isChecked())
-        self.config_manager.set_setting('discover_on_startup', self.discover_startup_check.isChecked())
-        
-        # UI settings
-        self.config_manager.set_setting('dark_mode', self.dark_mode_check.isChecked())
-        
+        settings = {
+            # Discovery settings
+            'auto_discover': self.auto_discover_check.isChecked(),
+            'discover_on_startup': self.discover_startup_check.isChecked(),
+            
+            # UI settings
+            'dark_mode': self.dark_mode_check.isChecked(),
+            'startup_check_updates': self.check_updates_check.isChecked(),
+            
+            # Network settings
+            'discovery_timeout': self.discovery_timeout_spin.value(),
+            'network_retry_count': self.network_retry_spin.value()
+        }
+        
+        # Combo box selections, if any
         notification_index = self.notification_combo.currentIndex()
-        if notification_index == 0:
-            self.config_manager.set_setting('notification_level', 'minimal')
-        elif notification_index == 1:
-            self.config_manager.set_setting('notification_level', 'normal')
-        elif notification_index == 2:
-            self.config_manager.set_setting('notification_level', 'verbose')
+        if 0 <= notification_index < len(NOTIFICATION_LEVELS):
+            settings['notification_level'] = NOTIFICATION_LEVELS[notification_index]
         
-        self.config_manager.set_setting('startup_check_updates', self.check_updates_check.isChecked())
-        
-        # Network settings
-        self.config_manager.set_setting('discovery_timeout', self.discovery_timeout_spin.value())
-        self.config_manager.set_setting('network_retry_count', self.network_retry_spin.value())
-        
-        # Logging settings
         log_index = self.log_level_combo.currentIndex()
-        if log_index == 0:
-            self.config_manager.set_setting('log_level', 'error')
-        elif log_index == 1:
-            self.config_manager.set_setting('log_level', 'warning')
-        elif log_index == 2:
-            self.config_manager.set_setting('log_level', 'info')
-        elif log_index == 3:
-            self.config_manager.set_setting('log_level', 'debug')
+        if 0 <= log_index < len(LOG_LEVELS):
+            settings['log_level'] = LOG_LEVELS[log_index]
+        
+        self.config_manager.update_settings(settings)
         
         # Save to disk
         self.config_manager.save_config()
@@ -2,6 +2,8 @@
 SVG icons for the Smart Light Controller
 """
 
+from functools import lru_cache
+
 from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtCore import QByteArray, QSize
 from PySide6.QtSvg import QSvgRenderer
@@ -189,10 +191,13 @@ _ICONS = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_icon(name, color=None, size=None):
     """
     Get a QIcon object for the given name
     
+    Icons are built once per argument combination and shared between callers.
+    
     Args:
         name: Icon name from the dictionary
         color: Optional color to apply (not used yet)
@@ -7,10 +7,12 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider,
     QGroupBox, QComboBox, QFormLayout, QFrame, QCheckBox
 )
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import Qt, QTimer, Slot
 from PySide6.QtGui import QFont, QColor
 
-from ..constants import APP_NAME, ATTR_BRIGHTNESS, ATTR_COLOR_TEMP
+from ..constants import (
+    APP_NAME, ATTR_BRIGHTNESS, ATTR_COLOR_TEMP, ATTR_RGB_COLOR, CONTROL_SEND_INTERVAL
+)
 from .color_picker import ColorPickerWidget
 from .icons import get_icon
 
@@ -33,6 +35,16 @@ class LightControlWidget(QWidget):
         self.current_protocol = None
         self.current_light_id = None
         
+        # Slider and color picker changes are merged and sent at most once
+        # per interval, so dragging does not issue a command for every step
+        self._pending_light = None  # (protocol, light ID) the pending state is for
+        self._pending_state = {}
+        self._send_timer = QTimer(self)
+        self._send_timer.setSingleShot(True)
+        self._send_timer.setTimerType(Qt.PreciseTimer)
+        self._send_timer.setInterval(CONTROL_SEND_INTERVAL)
+        self._send_timer.timeout.connect(self._flush_pending)
+        
         # Set up UI
         self.init_ui()
         
@@ -180,6 +192,9 @@ class LightControlWidget(QWidget):
             protocol: Light protocol ('hue' or 'lifx')
             light_id: Light identifier
         """
+        # Send changes still pending for the previous light
+        self._flush_pending()
+        
         if not protocol or not light_id:
             # Clear light selection
             self.current_protocol = None
@@ -299,6 +314,9 @@ class LightControlWidget(QWidget):
         # Update label
         self.power_label.setText("ON" if checked else "OFF")
         
+        # Send pending slider changes first so commands stay in order
+        self._flush_pending()
+        
         # Send command to light
         state = {'on': checked}
         success = self.light_manager.set_light_state(
@@ -317,14 +335,8 @@ class LightControlWidget(QWidget):
         # Update label
         self.brightness_label.setText(f"{value}%")
         
-        # Send command to light (throttled in a real implementation)
-        state = {ATTR_BRIGHTNESS: value}
-        success = self.light_manager.set_light_state(
-            self.current_protocol, self.current_light_id, state
-        )
-        
-        if not success:
-            logger.error(f"Failed to set brightness for {self.current_protocol}/{self.current_light_id}")
+        # Queue command to light
+        self._queue_state({ATTR_BRIGHTNESS: value})
     
     @Slot(int)
     def on_temp_changed(self, value):
@@ -335,14 +347,8 @@ class LightControlWidget(QWidget):
         # Update label
         self.temp_label.setText(f"{value}K")
         
-        # Send command to light (throttled in a real implementation)
-        state = {ATTR_COLOR_TEMP: value}
-        success = self.light_manager.set_light_state(
-            self.current_protocol, self.current_light_id, state
-        )
-        
-        if not success:
-            logger.error(f"Failed to set color temperature for {self.current_protocol}/{self.current_light_id}")
+        # Queue command to light
+        self._queue_state({ATTR_COLOR_TEMP: value})
     
     @Slot(QColor)
     def on_color_selected(self, color):
@@ -350,15 +356,49 @@ class LightControlWidget(QWidget):
         if not self.current_protocol or not self.current_light_id:
             return
         
-        # Send command to light
-        rgb_color = (color.red(), color.green(), color.blue())
-        state = {'rgb_color': rgb_color}
-        success = self.light_manager.set_light_state(
-            self.current_protocol, self.current_light_id, state
-        )
+        # Queue command to light
+        self._queue_state({ATTR_RGB_COLOR: (color.red(), color.green(), color.blue())})
+    
+    def _queue_state(self, state):
+        """
+        Merge a state change into the pending command for the current light
+        
+        The pending state is sent when the send timer fires; the timer is not
+        restarted by later changes, so a continuous drag still sends regularly.
+        
+        Args:
+            state: State changes to apply
+        """
+        light = (self.current_protocol, self.current_light_id)
+        if self._pending_light != light:
+            self._flush_pending()
+            self._pending_light = light
+        
+        # A color and a color temperature replace each other
+        if ATTR_RGB_COLOR in state:
+            self._pending_state.pop(ATTR_COLOR_TEMP, None)
+        elif ATTR_COLOR_TEMP in state:
+            self._pending_state.pop(ATTR_RGB_COLOR, None)
+        
+        self._pending_state.update(state)
+        if not self._send_timer.isActive():
+            self._send_timer.start()
+    
+    @Slot()
+    def _flush_pending(self):
+        """Send the pending state changes in a single command"""
+        self._send_timer.stop()
+        if not self._pending_state:
+            return
+        
+        protocol, light_id = self._pending_light
+        state = self._pending_state
+        self._pending_state = {}
+        
+        success = self.light_manager.set_light_state(protocol, light_id, state)
         
         if not success:
-            logger.error(f"Failed to set color for {self.current_protocol}/{self.current_light_id}")
+            logger.error(f"Failed to set light state for {protocol}/{light_id}")
     
     def apply_preset_color(self, color):
         """Apply a preset color to the light"""
@@ -373,6 +413,9 @@ class LightControlWidget(QWidget):
         self.color_picker.set_color(qcolor)
         self.color_picker.blockSignals(False)
         
+        # Send pending slider changes first so commands stay in order
+        self._flush_pending()
+        
         # Send command to light
         state = {'rgb_color': color}
         success = self.light_manager.set_light_state(